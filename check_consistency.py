@@ -0,0 +1,109 @@
+from code.algorithms.hillclimber import Hillclimber
+from code.algorithms.simulated_annealing import SimulatedAnnealing
+from code.algorithms.heuristics_hillclimber import ProblematicActivityClimber, ProblematicStudentsClimber, MutationProbabilityClimber, IncreasingMutationsClimber
+
+from code.classes.schedule import Schedule
+from code.classes.problem_instance import ProblemInstance
+from code.classes.compact_schedule import CompactSchedule
+
+import argparse
+
+
+def check_indexed_set(indexed_set, expected : set, name : str) -> None:
+    """
+    Checks that an indexed set holds exactly the expected items, at the positions it stores.
+    """
+    assert set(indexed_set) == expected, f'{name} differs from its definition'
+    assert len(indexed_set.items) == len(indexed_set.positions), f'{name} holds an item twice'
+    assert all(indexed_set[position] is item for item, position in indexed_set.positions.items()), f'{name} has wrong positions'
+
+def check_ranking(ranking, objects, name : str) -> None:
+    """
+    Checks that a ranking holds exactly the given objects, each in the bucket of its current maluspoints.
+    """
+    assert ranking.scores == {obj: obj.maluspoints for obj in objects}, f'{name} has outdated maluspoints'
+    assert ranking.levels == sorted(ranking.buckets), f'{name} levels differ from its buckets'
+
+    for score, bucket in ranking.buckets.items():
+        assert bucket, f'{name} keeps an empty bucket'
+        check_indexed_set(bucket, {obj for obj in objects if obj.maluspoints == score}, f'{name} bucket {score}')
+
+def check_schedule(algorithm) -> None:
+    """
+    Checks that the incrementally kept state of the schedule of an algorithm equals
+    the state computed from scratch: the maluspoints of the schedule, its activities and
+    students, the archive of free roomslots, the switchable activities and the rankings.
+    """
+    schedule = algorithm.schedule
+
+    # the free roomslots and the activities students can be switched from
+    check_indexed_set(schedule.archive, {roomslot_id for roomslot_id, activity in enumerate(schedule.occupancy) if activity is None}, 'archive')
+    check_indexed_set(schedule.switchable_activities,
+                      {activity for activity in schedule.activities
+                       if activity.is_tutorial_practical() and activity.students and len(activity.course.activities[activity.name[0]]) > 1},
+                      'switchable activities')
+
+    if isinstance(algorithm, ProblematicActivityClimber):
+        check_ranking(algorithm.activity_ranking, schedule.activities, 'activity ranking')
+        check_ranking(algorithm.switchable_ranking, schedule.switchable_activities, 'switchable ranking')
+
+    # store the incrementally computed maluspoints, then evaluate the whole schedule again
+    maluspoints = schedule.get_maluspoints()
+    activity_maluspoints = {activity: activity.maluspoints for activity in schedule.activities}
+    student_maluspoints = {student: student.maluspoints for student in schedule.students}
+
+    schedule.get_total_maluspoints()
+
+    assert maluspoints == schedule.get_maluspoints(), f'incremental {maluspoints} != full {schedule.get_maluspoints()}'
+    assert maluspoints == CompactSchedule(schedule).get_maluspoints(), f'incremental {maluspoints} != compact {CompactSchedule(schedule).get_maluspoints()}'
+    assert activity_maluspoints == {activity: activity.maluspoints for activity in schedule.activities}, 'activity maluspoints differ'
+    assert student_maluspoints == {student: student.maluspoints for student in schedule.students}, 'student maluspoints differ'
+
+def run_check(algorithm, iterations : int, stuck_interval : int) -> None:
+    """
+    Runs an algorithm and checks its schedule after every iteration. Every other stuck_interval
+    iterations the algorithm is made to look stuck, so activities are added to courses as well.
+    """
+    def check_iteration(iteration, maluspoints):
+        check_schedule(algorithm)
+
+        if (iteration // stuck_interval) % 2:
+            algorithm.no_change_counter = 2000
+
+    check_schedule(algorithm)
+    algorithm.add_observer(check_iteration)
+    algorithm.run(iterations)
+
+    # simulated annealing restores its best schedule after the last iteration
+    check_schedule(algorithm)
+
+def main(iterations, stuck_interval, seed):
+    instance = ProblemInstance.load('data/studenten_en_vakken.csv', 'data/vakken.csv', 'data/zalen.csv')
+    empty_schedule = Schedule(instance)
+
+    algorithms = [Hillclimber(empty_schedule, seed=seed),
+                  ProblematicActivityClimber(empty_schedule, seed=seed),
+                  ProblematicStudentsClimber(empty_schedule, seed=seed),
+                  MutationProbabilityClimber(empty_schedule, seed=seed),
+                  IncreasingMutationsClimber(empty_schedule, seed=seed),
+                  SimulatedAnnealing(empty_schedule, 50, seed=seed)]
+
+    for algorithm in algorithms:
+        run_check(algorithm, iterations, stuck_interval)
+        print(f'{type(algorithm).__name__}: consistent for {iterations} iterations ({algorithm.schedule.total_maluspoints} maluspoints, {len(algorithm.schedule.activities)} activities)')
+
+
+if __name__ == "__main__":
+    # Set-up parsing command line arguments
+    parser = argparse.ArgumentParser(description = "check incremental maluspoints and schedule state against a full evaluation")
+
+    # Adding arguments
+    parser.add_argument("-i", "--iterations", type=int, default = 1000, help="iterations per algorithm (default: 1000)")
+    parser.add_argument("-si", "--stuck_interval", type=int, default = 100, help="iterations between making algorithms look stuck (default: 100)")
+    parser.add_argument("-sd", "--seed", type=int, default=0, help="random seed (default: 0)")
+
+    # Read arguments from command line
+    args = parser.parse_args()
+
+    # Run main with provide arguments
+    main(args.iterations, args.stuck_interval, args.seed)
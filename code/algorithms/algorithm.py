@@ -1,8 +1,16 @@
 import random
 import copy
-import matplotlib.pylab as plt
 from ..classes.schedule import Schedule
 from ..classes.activity import Activity
+from ..visualization import plotting
+
+
+def print_progress(iteration, maluspoints):
+    """
+    Observer that prints the iteration and the current total maluspoints.
+    """
+    print(f'iteration {iteration}: {maluspoints.total} maluspoints')
+
 
 class Algorithm:
     """
@@ -22,17 +30,52 @@ class Algorithm:
         number of consecutive iterations without improvement after which to stop the algorithm
     no_change_counter: int
         number of consecutive iterations without improvements of/ changes to the schedule 
+    rng: random.Random
+        random number generator all random choices of this algorithm are drawn from
+    observers: list[tuple]
+        observers (function, event and interval) called during a run
+    undo_log: list[tuple]
+        moves (method and arguments) that undo the latest mutation, in order of application
     """
-    def __init__(self, schedule : Schedule, early_stopping : bool=False, early_stopping_limit=2000):
+    def __init__(self, schedule : Schedule, early_stopping : bool=False, early_stopping_limit=2000, seed=None):
         self.schedule = copy.deepcopy(schedule)
+        self.rng = self.create_rng(seed)
         self.maluspoint_stats = []
         self.early_stopping = early_stopping
         self.early_stopping_limit = early_stopping_limit
         self.no_change_counter = 0
+        self.undo_log = []
+        self.observers = []
 
     def run(self):
         raise NotImplementedError
 
+    def add_observer(self, observer, event : str='iteration', every : int=1):
+        """
+        Registers an observer that is called with the iteration and the maluspoints (Maluspoints)
+        of the current schedule during a run. For event 'iteration' it is called every given 
+        number of iterations, for event 'improvement' whenever the maluspoints decreased.
+        """
+        self.observers.append((observer, event, every))
+
+    def notify_observers(self, iteration : int, maluspoints, improved : bool):
+        """
+        Calls the observers registered for this iteration.
+        """
+        for observer, event, every in self.observers:
+            if (event == 'iteration' and iteration % every == 0) or (event == 'improvement' and improved):
+                observer(iteration, maluspoints)
+
+    def create_rng(self, seed) -> random.Random:
+        """
+        Returns a random number generator for the given seed. A random.Random
+        instance is used as is, so algorithms can share one stream.
+        """
+        if isinstance(seed, random.Random):
+            return seed
+
+        return random.Random(seed)
+
     def reset_no_change_counter(self):
         """
         Resets no change counter to 0
@@ -45,11 +88,28 @@ class Algorithm:
         """ 
         self.no_change_counter += 1
 
-    def revert_to_previous_schedule(self, previous_schedule):
+    def log_move(self, undo_move, *arguments):
         """
-        Reverts current schedule back to previous schedule.
+        Adds the move that undoes the move just made to the undo log.
         """
-        self.schedule = previous_schedule
+        self.undo_log.append((undo_move, arguments))
+
+    def revert_to_previous_schedule(self):
+        """
+        Reverts current schedule back to previous schedule by undoing all
+        moves of the latest mutation in reverse order.
+        """
+        # take the log, the undo moves themselves are logged to a list we discard
+        moves = self.undo_log
+        self.undo_log = []
+
+        for undo_move, arguments in reversed(moves):
+            undo_move(*arguments)
+
+        self.undo_log = []
+
+        # restore the maluspoints of the students and activities involved
+        self.schedule.get_maluspoints_delta()
 
     def check_stagnation(self) -> bool:
         """
@@ -57,18 +117,11 @@ class Algorithm:
         """    
         return self.early_stopping_limit == self.no_change_counter
 
-    def update_student_schedules(self):
-        """
-        Update all stutdents' schedules with their current activities.
-        """
-        for student in self.schedule.students:
-            student.update_schedule()
-
     def pick_roomslot(self):
         """
-        Returns a random roomslot.
+        Returns a random roomslot id.
         """
-        return random.choice(self.schedule.roomslots)
+        return self.rng.randrange(len(self.schedule.roomslots))
     
     def is_lecture(self, activity_type):
         """
@@ -78,9 +131,9 @@ class Algorithm:
 
     def pick_activity(self, activities):
         """
-        Returns a random activity and it's type and course from activities.
+        Returns a random activity and it's type and course from activities (a list or IndexedSet).
         """
-        activity = random.choice(list(activities))
+        activity = self.rng.choice(activities)
         course = activity.course
         activity_type = activity.name[0]
 
@@ -88,65 +141,64 @@ class Algorithm:
     
     def pick_student(self, students):
         """
-        Returns a random student from students.
+        Returns a random student from students (a list or IndexedSet).
         """
-        return random.choice(list(students))
+        return self.rng.choice(students)
     
     def pick_students_to_switch(self, students, N):
         """
-        Returns N random students from students.
+        Returns N (at most all) random students from students.
         """
-        random.shuffle(list(students))
-        return list(students)[:N]
+        return self.rng.sample(students, min(N, len(students)))
     
     def move_student(self, student, current_activity, switch_activity):
         """
         Moves a student from their current activity to the switch activity.
         """
-        # remove current and add new activity from student's activities set
-        student.activities.remove(current_activity)
-        student.activities.add(switch_activity)
-
-        student.update_schedule()
+        # remove current and add new activity from student's activities and schedule
+        student.remove_activity(current_activity)
+        student.add_activity(switch_activity)
 
         # remove student from current and add to new activity's students set
         current_activity.students.remove(student)
         switch_activity.students.add(student)
+
+        # mark student and activities for re-evaluation
+        self.schedule.changed_students.add(student)
+        self.schedule.changed_activities.update((current_activity, switch_activity))
+        self.schedule.update_switchable_activities((current_activity, switch_activity))
+
+        self.log_move(self.move_student, student, switch_activity, current_activity)
     
     def move_student_to_new_activity(self, student, course, activity_type, new_activity):
         """
         Moves a student from their current activity to the new activity if their current 
         activity is not know.
         """
-        # get the list of activities for this activity type
-        activities = course.activities[activity_type]
-        
-        # loop over activities and move student if they are in the activity
-        for activity in activities:
-            if activity != new_activity and activity in student.activities:
-                self.move_student(student, activity, new_activity)
+        # look up the group of the student for this activity type
+        activity = student.group_activities.get((course, activity_type))
+
+        # move student if they are in another group
+        if activity and activity != new_activity:
+            self.move_student(student, activity, new_activity)
 
     def switch_student_from_activities(self):
         """
         Switches a student from one of their current activities to 
         another activity of the same type in the same course. 
         """
-        # pick an activity to switch student from
-        activity, activity_type, course = self.pick_activity(self.schedule.activities)
-        
-        # activity needs to be tutorial or practical, have students and have at least one other activity of same type
-        while not activity.is_tutorial_practical() or len(course.activities[activity_type]) <= 1 or len(activity.students) == 0:
-            activity, activity_type, course = self.pick_activity(self.schedule.activities)
+        # pick an activity to switch student from, a tutorial or practical with students and another activity of same type
+        activity, activity_type, course = self.pick_activity(self.schedule.switchable_activities)
 
         # pick student to switch
         student = self.pick_student(activity.students)
         
-        # pick activity to switch student to
-        switch_activity = random.choice(course.activities[activity_type])
+        # pick activity to switch student to from the other activities, the last one takes the place of the first activity
+        activities = course.activities[activity_type]
+        switch_activity = activities[self.rng.randrange(len(activities) - 1)]
 
-        # pick new activity if new activity is same as first activity
-        while switch_activity == activity:
-            switch_activity = random.choice(course.activities[activity_type])
+        if switch_activity == activity:
+            switch_activity = activities[-1]
 
         # move another student to this activity if new activity is full
         if switch_activity.is_full():
@@ -156,61 +208,54 @@ class Algorithm:
         # move this student to other activity
         self.move_student(student, activity, switch_activity)
 
-    def update_archive(self, activity, current_roomslot, new_roomslot):
-        """ 
-        When switching activities, updates the archive if activity is switched to a free room.
-        """
-        # split tuples in variables
-        room_current, day_current, time_current = current_roomslot
-        room_new, day_new, time_new = new_roomslot
-        
-        # if there is no activity in a room slot  
-        if not activity:
-           
-            # loop over still available rooms 
-            for item in self.schedule.archive:
-               
-                # if room, day, time are found in archive 
-                if room_current.room_number == item[0].room_number and day_current == item[1] and time_current == item[2]:
-                  
-                    # remove old activity from archive 
-                    self.schedule.archive.remove(item)
-                   
-                    # add new activity to archive 
-                    self.schedule.archive.append((room_new, day_new, time_new)) 
-                    break
-
     def switch_activities(self):
         """
         Switches two activities' roomslots. One activity may be empty.
         """
-        # store room, day, and time of roomslot
+        # pick a roomslot and an activity to switch with
         roomslot1 = self.pick_roomslot()
-        room_1, day_1, time_1 = roomslot1
-
-        # activities as variables
-        activity_1 = room_1.schedule[day_1][time_1]
         activity_2 = self.pick_activity(self.schedule.activities)[0]
 
         # store roomslot of activity 2
-        roomslot2 = (activity_2.room, activity_2.day, activity_2.time)
-        room_2, day_2, time_2 = roomslot2
+        roomslot2 = activity_2.roomslot_id
+
+        self.swap_roomslots(roomslot1, roomslot2)
+
+    def swap_roomslots(self, roomslot1, roomslot2):
+        """
+        Swaps the contents of two roomslots (ids), either of which may be empty.
+        """
+        occupancy = self.schedule.occupancy
+
+        # activities as variables
+        activity_1 = occupancy[roomslot1]
+        activity_2 = occupancy[roomslot2]
+
+        # empty both roomslots, then schedule each activity in the other roomslot (also updates its students' schedules)
+        occupancy[roomslot1] = None
+        occupancy[roomslot2] = None
 
-        # if activity is Activity instance, schedule instance
         if activity_1:
-            activity_1.schedule(room_2, day_2, time_2)
+            self.schedule.schedule_activity(activity_1, roomslot2)
         if activity_2:
-            activity_2.schedule(room_1, day_1, time_1)
-        
-        # switch the activities to the other roomslot in room instance
-        room_1.schedule[day_1][time_1] = activity_2
-        room_2.schedule[day_2][time_2] = activity_1
-
-        self.update_student_schedules()
+            self.schedule.schedule_activity(activity_2, roomslot1)
         
-        # update the archive if an activity is switched to an empty spot 
-        self.update_archive(activity_1, roomslot1, roomslot2)
-        self.update_archive(activity_2, roomslot2, roomslot1)
+        # if an activity is switched to an empty roomslot, its old roomslot becomes the free one
+        if activity_1 and not activity_2:
+            self.schedule.archive.remove(roomslot2)
+            self.schedule.archive.add(roomslot1)
+        elif activity_2 and not activity_1:
+            self.schedule.archive.remove(roomslot1)
+            self.schedule.archive.add(roomslot2)
+
+        # mark switched activities and their students for re-evaluation
+        for activity in (activity_1, activity_2):
+            if activity:
+                self.schedule.changed_activities.add(activity)
+                self.schedule.changed_students.update(activity.students)
+
+        # swapping the same roomslots again undoes this move
+        self.log_move(self.swap_roomslots, roomslot1, roomslot2)
 
                        
     def create_new_activity(self, activity, activity_type, course):
@@ -220,13 +265,13 @@ class Algorithm:
         new_activity = Activity(new_name, activity.capacity, course)
 
         # pick random room from still available 
-        room, day, time = random.choice(self.schedule.archive)
+        roomslot = self.schedule.archive.pick(self.rng)
 
         # schedule this new activity to an open roomslot
-        new_activity.schedule(room, day, time)
+        self.schedule.schedule_activity(new_activity, roomslot)
 
         # remove room from still available 
-        self.schedule.archive.remove((room, day, time)) 
+        self.schedule.archive.remove(roomslot)
 
         return new_activity
 
@@ -257,27 +302,70 @@ class Algorithm:
             # create and schedule new activity to roomslot
             new_activity = self.create_new_activity(activity, activity_type, course)
 
-            # add new activity to course  
+            # add new activity to course, students can now be switched between its other activities
             course.activities[activity_type].append(new_activity)
+            self.schedule.update_switchable_activities(course.activities[activity_type])
+
+            # add new activity to list of total activities in schedule 
+            self.schedule.activities.append(new_activity)
 
-            # update list of total activities in schedule 
-            self.schedule.activities = self.schedule.get_activities_list(self.schedule.courses)
+            # logged before the student moves, so it is undone after they are moved back
+            self.log_move(self.remove_activity_from_course, new_activity)
             
             # move student to new activity
             self.add_students_to_activity(new_activity, activity_type, course)
         
+    def remove_activity_from_course(self, activity):
+        """
+        Removes an (empty) activity from its course and frees its roomslot.
+        """
+        activity_type = activity.name[0]
+
+        # remove activity from course and from list of total activities in schedule
+        activity.course.activities[activity_type].remove(activity)
+        self.remove_from_activities_list(activity)
+
+        # students can not be switched from an activity that is the only one of its type
+        self.schedule.switchable_activities.discard(activity)
+        self.schedule.update_switchable_activities(activity.course.activities[activity_type])
+
+        # free the roomslot and make it available again
+        self.schedule.occupancy[activity.roomslot_id] = None
+        self.schedule.archive.add(activity.roomslot_id)
+
+    def remove_from_activities_list(self, activity) -> None:
+        """
+        Removes an activity from the list of total activities in schedule.
+        """
+        activities = self.schedule.activities
+
+        # added activities are removed in reverse order when undoing, so it is usually the last one
+        if activities[-1] is activity:
+            activities.pop()
+        else:
+            activities.remove(activity)
+
+    def mutate(self, number_of_mutations : int=1):
+        """
+        Mutates the schedule with a fresh undo log, so only the moves of this
+        mutation are reverted. Mutations are chosen by mutate_schedule.
+        """
+        self.undo_log = []
+        self.mutate_schedule(number_of_mutations)
+
     def mutate_schedule(self, number_of_mutations : int=1):
         """
         Mutate current schedule/timetable with a number of random mutations.
+        Moves are logged so they can be reverted, use mutate to start a new log.
         """
         # loop for the number of iterations specified
         for mutation in range(number_of_mutations):
             
             # randomly choose mutation, only add activities if algorithm is stuck
             if self.no_change_counter > 500 and self.schedule.archive:
-                mutation = random.choice([self.switch_student_from_activities, self.switch_activities, self.add_activity_to_course])
+                mutation = self.rng.choice([self.switch_student_from_activities, self.switch_activities, self.add_activity_to_course])
             else:
-                mutation = random.choice([self.switch_student_from_activities, self.switch_activities])
+                mutation = self.rng.choice([self.switch_student_from_activities, self.switch_activities])
             mutation()
 
     def display_maluspoints_division(self, title):
@@ -299,6 +387,9 @@ class Algorithm:
         """
         Plot maluspoints as a function of number of iterations (for hillclimber)
         """
+        # import matplotlib only when plotting, so runs without plots start faster
+        import matplotlib.pyplot as plt
+
         # intialize variables
         iters = len(self.maluspoint_stats)
 
@@ -309,8 +400,5 @@ class Algorithm:
         plt.suptitle(title, fontsize=12)
         plt.title(f'N = {iters}', loc='center', fontsize=9)
         plt.title(f'final maluspoints = {self.maluspoint_stats[-1]}', loc='left', fontsize=9)
-        if save:
-            plt.savefig(output_file)
-
-        plt.show()
+        plotting.finish_figure(output_file if save else None)
 
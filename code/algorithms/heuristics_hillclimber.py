@@ -1,7 +1,8 @@
-import random
+import heapq
 import math
 
 from code.classes.schedule import Schedule
+from code.classes.ranking import Ranking
 
 from .hillclimber import Hillclimber
 
@@ -9,42 +10,119 @@ class HeuristicsHillclimber(Hillclimber):
     """
     A class representing heuristic hillclimbers.
     """
-    def __init__(self, empty_schedule: Schedule, early_stopping: bool = False):
-        super().__init__(empty_schedule, early_stopping)
+    def __init__(self, empty_schedule: Schedule, early_stopping: bool = False, seed=None):
+        super().__init__(empty_schedule, early_stopping, seed)
 
     def get_objects_with_most_maluspoints(self, objects : list, top_n : int=20) -> list:
         """
         Returns a list of the top N objects with most maluspoints.
         """
-        return sorted(objects, key=lambda object: object.maluspoints, reverse=True)[:top_n]
+        return heapq.nlargest(top_n, objects, key=lambda object: object.maluspoints)
 
     
 class ProblematicActivityClimber(HeuristicsHillclimber):
     """
     A class representing the problematic activity heuristic, which selects random activities from those with the most maluspoints whenever
     we need to pick activities for a mutation.
+
+    . . .
+
+    Attributes
+    ----------
+    activity_ranking: Ranking
+        all activities of the schedule ranked by maluspoints
+    switchable_ranking: Ranking
+        the activities students can be switched from ranked by maluspoints
+    new_activities: list[Activity]
+        activities created since the last evaluation
     """
-    def __init__(self, empty_schedule: Schedule, early_stopping: bool = False):
-        super().__init__(empty_schedule, early_stopping)
+    def __init__(self, empty_schedule: Schedule, early_stopping: bool = False, seed=None):
+        super().__init__(empty_schedule, early_stopping, seed)
+
+        # the start schedule is evaluated, later only changed activities are ranked again
+        self.activity_ranking = Ranking(self.schedule.activities)
+        self.switchable_ranking = Ranking(self.schedule.switchable_activities)
+        self.new_activities = []
 
     def pick_activity(self, activities : list):
         """
         Returns a random activity from the top 1/3 activities with most maluspoints.
         """
+        # activities are either all activities or the activities students can be switched from
+        ranking = self.switchable_ranking if activities is self.schedule.switchable_activities else self.activity_ranking
+
         # set N as 1/3 of the total activities list
-        N = math.ceil(len(activities) / 3)
+        N = math.ceil(len(ranking) / 3)
+
+        activity = ranking.pick_top(self.rng, N)
+
+        return activity, activity.name[0], activity.course
 
-        top_activities = self.get_objects_with_most_maluspoints(activities, N)
+    def create_new_activity(self, activity, activity_type, course):
+        """
+        Creates a new activity and remembers it, so it is ranked at the next evaluation.
+        """
+        new_activity = super().create_new_activity(activity, activity_type, course)
+        self.new_activities.append(new_activity)
+
+        return new_activity
+
+    def check_improvement(self, previous_maluspoints : int):
+        """
+        Checks whether the new schedule improves upon the previous schedule, then ranks 
+        the activities whose maluspoints may have changed again.
+        """
+        students = list(self.schedule.changed_students)
+        new_activities = self.new_activities
+        self.new_activities = []
 
-        return super().pick_activity(top_activities)
+        # changed activities and the activities of changed students that were double booked before evaluation
+        activities = set(self.schedule.changed_activities)
+
+        for student in students:
+            activities.update(student.double_booked_activities)
+
+        super().check_improvement(previous_maluspoints)
+
+        # activities of the same students that are double booked after evaluation (or reverting)
+        for student in students:
+            activities.update(student.double_booked_activities)
+
+        self.update_rankings(activities, new_activities)
+
+    def update_rankings(self, activities : set, new_activities : list):
+        """
+        Ranks the given activities again, adding them if they became switchable and 
+        removing them if they no longer are. New activities are removed if they were
+        removed from the schedule again when reverting.
+        """
+        # adding or removing an activity changes whether the other activities of its type are switchable
+        for new_activity in new_activities:
+            course_activities = new_activity.course.activities[new_activity.name[0]]
+            activities.update(course_activities)
+
+            if new_activity not in course_activities:
+                activities.discard(new_activity)
+                self.activity_ranking.discard(new_activity)
+                self.switchable_ranking.discard(new_activity)
+
+        # rank in a fixed order, sets iterate in an order that differs between runs and
+        # the order within a bucket decides which activity is picked
+        for activity in sorted(activities, key=lambda activity: (activity.course.name, activity.name)):
+            self.activity_ranking.update(activity)
+
+            if activity in self.schedule.switchable_activities:
+                self.switchable_ranking.update(activity)
+            else:
+                self.switchable_ranking.discard(activity)
     
 class ProblematicStudentsClimber(HeuristicsHillclimber):
     """
     A class representing the problematic students heuristic, which selects random students from those with the most maluspoints whenever
     we need to pick students for a mutation.
     """
-    def __init__(self, empty_schedule: Schedule, early_stopping: bool = False):
-        super().__init__(empty_schedule, early_stopping)
+    def __init__(self, empty_schedule: Schedule, early_stopping: bool = False, seed=None):
+        super().__init__(empty_schedule, early_stopping, seed)
 
     def pick_student(self, students : list):
         """
@@ -68,8 +146,8 @@ class MutationProbabilityClimber(HeuristicsHillclimber):
     A class representing the mutation probability heuristic for which the probability of certain mutations being made shifts/changes
     as the algorithm progresses and (potentially) stagnates.
     """
-    def __init__(self, empty_schedule: Schedule, early_stopping: bool = False):
-        super().__init__(empty_schedule, early_stopping)
+    def __init__(self, empty_schedule: Schedule, early_stopping: bool = False, seed=None):
+        super().__init__(empty_schedule, early_stopping, seed)
     
     def mutate_schedule(self, number_of_mutations : int = 1):
         """
@@ -82,13 +160,13 @@ class MutationProbabilityClimber(HeuristicsHillclimber):
 
             # only try adding activities if algorithm is stuck and roomslots are available      
             if self.no_change_counter > 500 and self.schedule.archive:
-                mutation = random.choices([self.switch_student_from_activities, self.switch_activities, self.add_activity_to_course], weights=(.2, .2, .6))[0]
+                mutation = self.rng.choices([self.switch_student_from_activities, self.switch_activities, self.add_activity_to_course], weights=(.2, .2, .6))[0]
             
             # try switching activities more in early iterations and students in later iterations
             elif self.iteration < 1000:
-                mutation = random.choices([self.switch_student_from_activities, self.switch_activities], weights=(.2, .8))[0]
+                mutation = self.rng.choices([self.switch_student_from_activities, self.switch_activities], weights=(.2, .8))[0]
             else:
-                mutation = random.choices([self.switch_student_from_activities, self.switch_activities], weights=(.8, .2))[0]
+                mutation = self.rng.choices([self.switch_student_from_activities, self.switch_activities], weights=(.8, .2))[0]
             
             mutation()
 
@@ -97,8 +175,8 @@ class IncreasingMutationsClimber(HeuristicsHillclimber):
     A class representing the increasing mutations heuristic for which the number of mutations made to the schedule increases 
     as the algorithm progresses.
     """
-    def __init__(self, empty_schedule: Schedule, early_stopping: bool = False):
-        super().__init__(empty_schedule, early_stopping)
+    def __init__(self, empty_schedule: Schedule, early_stopping: bool = False, seed=None):
+        super().__init__(empty_schedule, early_stopping, seed)
         
     def pick_number_mutations(self):
         """
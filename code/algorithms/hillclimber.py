@@ -1,11 +1,10 @@
-import copy
 import sys
 
 from .random_alg import FittedStart
 from .algorithm import Algorithm
 from ..classes.schedule import Schedule
 
-# increase recursion limit for deepcopies
+# increase recursion limit for deepcopies of whole schedules (initial and best schedules)
 # sadly this is a bandaid fix we were not able to fix in the timespan of this course
 sys.setrecursionlimit(10**6)
 
@@ -24,17 +23,20 @@ class Hillclimber(Algorithm):
     iteration: int
         current iteration
     """
-    def __init__(self, empty_schedule : Schedule, early_stopping : bool=False):
-        super().__init__(empty_schedule)
-        self.start_schedule = FittedStart(empty_schedule)
+    def __init__(self, empty_schedule : Schedule, early_stopping : bool=False, seed=None):
+        super().__init__(empty_schedule, seed=seed)
+        self.start_schedule = FittedStart(empty_schedule, seed=self.rng)
         self.schedule = self.start_schedule.schedule
         self.iteration = 0
 
-    def accept_schedule(self, schedule : Schedule):
+        # evaluate the start schedule fully, later changes are evaluated incrementally
+        self.schedule.get_total_maluspoints()
+
+    def accept_schedule(self, maluspoints : int):
         """
-        Accept given schedule by appending it's maluspoints
+        Accept schedule with given maluspoints by appending it's maluspoints
         """
-        self.maluspoint_stats.append(schedule.get_total_maluspoints())
+        self.maluspoint_stats.append(maluspoints)
 
     def pick_number_mutations(self):
         """
@@ -42,35 +44,36 @@ class Hillclimber(Algorithm):
         """
         return 1
 
-    def check_improvement(self, previous_schedule : Schedule):
+    def check_improvement(self, previous_maluspoints : int):
         """
         Checks whether the new schedule improves upon previous schedule (referencing maluspoints) 
         and adds the relevant maluspoints to statistics.
         If no improvement was made, resets schedule to previous state  
         """
-        # compute maluspoints for previous and current schedule 
-        previous_maluspoints = previous_schedule.get_total_maluspoints()
-        new_maluspoints = self.schedule.get_total_maluspoints()
+        # compute maluspoints for current schedule by only evaluating what changed
+        self.schedule.get_maluspoints_delta()
+        new_maluspoints = self.schedule.total_maluspoints
 
         # if improvement, reset counter and add number of maluspoint of new schedule to stats
         if new_maluspoints < previous_maluspoints:
             self.reset_no_change_counter()
-            self.accept_schedule(self.schedule)
+            self.accept_schedule(new_maluspoints)
 
         elif new_maluspoints == previous_maluspoints:
             self.increase_no_change_counter()
-            self.accept_schedule(self.schedule)
+            self.accept_schedule(new_maluspoints)
 
         # else, increase counter and revert changes to schedule
         else:
             self.increase_no_change_counter()
-            self.revert_to_previous_schedule(previous_schedule)
-            self.accept_schedule(previous_schedule)
+            self.revert_to_previous_schedule()
+            self.accept_schedule(previous_maluspoints)
         
     def run(self, iters  : int=10):
         """
         Improves the initial schedule for a number of iterations.
         Returns the final schedule when finished.
+        Registered observers are notified after each iteration.
         """
         self.iterations = iters
         
@@ -78,12 +81,9 @@ class Hillclimber(Algorithm):
         for i in range(1, iters + 1):
             
             self.iteration += 1
-            
-            if i % 100 == 0:
-                print(i)
         
-            # copy the previous schedule
-            previous_schedule = copy.deepcopy(self.schedule)
+            # store the maluspoints of the previous schedule, moves are undone through the undo log
+            previous_maluspoints = self.schedule.total_maluspoints
 
             # stop if no improvements made for early stopping limit
             if self.early_stopping:
@@ -95,10 +95,15 @@ class Hillclimber(Algorithm):
             N = self.pick_number_mutations()
 
             # make random change to schedule and check if improved
-            self.mutate_schedule(N)
-            self.check_improvement(previous_schedule)
+            self.mutate(N)
+            self.check_improvement(previous_maluspoints)
+
+            # pass on the maluspoints computed for this iteration
+            if self.observers:
+                maluspoints = self.schedule.get_maluspoints()
+                self.notify_observers(i, maluspoints, maluspoints.total < previous_maluspoints)
 
         # update final information
-        self.maluspoints = self.schedule.get_total_maluspoints()
+        self.maluspoints = self.schedule.total_maluspoints
 
    
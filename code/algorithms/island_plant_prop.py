@@ -0,0 +1,183 @@
+import multiprocessing
+import os
+
+from .plant_prop import PlantProp
+from ..classes.schedule import Schedule
+
+
+def run_island(connection, schedule : Schedule, N : int, seed : int):
+    """
+    Keeps the population of one island in a worker process and carries out
+    the commands sent by IslandPlantProp over the connection.
+    """
+    island = PlantProp(schedule, N, seed=seed)
+
+    trace = []
+    island.add_observer(lambda generation, maluspoints: trace.append(maluspoints))
+
+    while True:
+        command, argument = connection.recv()
+
+        # evolve the population for a number of generations
+        if command == 'run':
+            trace.clear()
+            start = len(island.evaluation_stats)
+
+            for generation in range(argument):
+                island.run_generation()
+
+            connection.send((island.evaluation_stats[start:], trace))
+
+        # send the best schedules of the population, it is sorted after each generation
+        elif command == 'emigrants':
+            connection.send(island.population[:argument])
+
+        # replace the worst schedules of the population by the arriving schedules
+        elif command == 'immigrants':
+            island.population[len(island.population) - len(argument):] = argument
+            island.update_population()
+
+        elif command == 'best':
+            connection.send((island.best_maluspoints, island.get_best_or_worst_schedule(worst=False)))
+
+        elif command == 'stop':
+            connection.close()
+            return
+
+
+class IslandPlantProp(PlantProp):
+    """
+    A class to represent plant propagation with an island model. Each island is a
+    population of its own that evolves in a worker process, and every migration_interval
+    generations the best schedules of each island migrate to its neighbouring islands.
+
+    . . .
+
+    Attributes
+    ----------
+    nr_islands: int
+        number of islands (worker processes)
+    migration_interval: int
+        number of generations between migrations
+    nr_migrants: int
+        number of best schedules each island sends to each of its neighbours
+    topology: str
+        'ring' sends migrants to the next island, 'complete' to all other islands
+    """
+    def __init__(self, schedule: Schedule, N : int=10, nr_islands : int=None, migration_interval : int=5, nr_migrants : int=1, topology : str='ring', seed=None):
+        # use one island per core by default
+        self.nr_islands = nr_islands or os.cpu_count() or 1
+        self.migration_interval = migration_interval
+        self.nr_migrants = nr_migrants
+        self.topology = topology
+
+        super().__init__(schedule, N, seed=seed)
+
+    def create_start_population(self) -> None:
+        """
+        Creates no population here, each island creates its own start population.
+        """
+        pass
+
+    def get_neighbours(self, island : int) -> list[int]:
+        """
+        Returns the islands the given island sends its migrants to.
+        """
+        if self.topology == 'ring':
+            return [(island + 1) % self.nr_islands] if self.nr_islands > 1 else []
+
+        elif self.topology == 'complete':
+            return [neighbour for neighbour in range(self.nr_islands) if neighbour != island]
+
+        raise ValueError(f"unknown topology '{self.topology}', use 'ring' or 'complete'")
+
+    def migrate(self, connections : list) -> None:
+        """
+        Sends the best schedules of each island to its neighbours, where they replace
+        the worst schedules.
+        """
+        for connection in connections:
+            connection.send(('emigrants', self.nr_migrants))
+
+        emigrants = [connection.recv() for connection in connections]
+        immigrants = [[] for island in range(self.nr_islands)]
+
+        for island in range(self.nr_islands):
+            for neighbour in self.get_neighbours(island):
+                immigrants[neighbour] += emigrants[island]
+
+        for connection, arriving in zip(connections, immigrants):
+            connection.send(('immigrants', arriving[:self.N]))
+
+    def start_islands(self) -> tuple[list, list]:
+        """
+        Starts a worker process for each island.
+        Returns the connections to and the processes of the islands.
+        """
+        connections = []
+        processes = []
+
+        for island in range(self.nr_islands):
+            connection, island_connection = multiprocessing.Pipe()
+            arguments = (island_connection, self.schedule, self.N, self.rng.randrange(2**32))
+            process = multiprocessing.Process(target=run_island, args=arguments, daemon=True)
+            process.start()
+
+            connections.append(connection)
+            processes.append(process)
+
+        return connections, processes
+
+    def stop_islands(self, connections : list, processes : list) -> None:
+        """
+        Stops the worker processes of the islands.
+        """
+        for connection in connections:
+            connection.send(('stop', None))
+            connection.close()
+
+        for process in processes:
+            process.join()
+
+    def run(self, evals : int=10) -> None:
+        """
+        Run plant propagation on all islands until the evaluations of all islands together
+        reach evals, migrating every migration_interval generations.
+        Registered observers are notified after each generation with the best maluspoints of all islands.
+        """
+        connections, processes = self.start_islands()
+
+        try:
+            while self.evaluation < evals:
+                for connection in connections:
+                    connection.send(('run', self.migration_interval))
+
+                results = [connection.recv() for connection in connections]
+
+                # combine the statistics of the islands per generation
+                for generation in range(self.migration_interval):
+                    evaluation = sum(evaluation_stats[generation] for evaluation_stats, trace in results)
+                    maluspoints = min((trace[generation] for evaluation_stats, trace in results), key=lambda maluspoints: maluspoints.total)
+                    improved = bool(self.maluspoint_stats) and maluspoints.total < self.maluspoint_stats[-1]
+
+                    self.evaluation = evaluation
+                    self.evaluation_stats.append(evaluation)
+                    self.maluspoint_stats.append(maluspoints.total)
+
+                    if self.observers:
+                        self.notify_observers(len(self.maluspoint_stats), maluspoints, improved)
+
+                self.migrate(connections)
+
+            # take the best schedule of all islands
+            for connection in connections:
+                connection.send(('best', None))
+
+            best_maluspoints, best_schedule = min((connection.recv() for connection in connections), key=lambda best: best[0])
+
+        finally:
+            self.stop_islands(connections, processes)
+
+        # save best schedule and maluspoints
+        best_schedule.apply_to(self.schedule)
+        self.maluspoints = best_maluspoints
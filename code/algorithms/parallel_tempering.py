@@ -0,0 +1,221 @@
+import multiprocessing
+import os
+
+from .hillclimber import Hillclimber
+from .simulated_annealing import SimulatedAnnealing
+from ..classes.schedule import Schedule
+from ..classes.compact_schedule import CompactSchedule
+
+
+def run_chain(connection, empty_schedule : Schedule, start_schedule : CompactSchedule, temperature : float, seed : int):
+    """
+    Keeps one annealing chain at a fixed temperature in a worker process and
+    carries out the commands sent by ParallelTempering over the connection.
+    """
+    # create the chain and start it from the given schedule
+    chain = SimulatedAnnealing(empty_schedule, temperature, cooling_function=None, seed=seed)
+    start_schedule.apply_to(chain.schedule)
+
+    trace = []
+    chain.add_observer(lambda iteration, maluspoints: trace.append(maluspoints))
+
+    while True:
+        command, argument = connection.recv()
+
+        # run for a number of iterations, the best schedule is only restored when asked for
+        if command == 'run':
+            trace.clear()
+            Hillclimber.run(chain, argument)
+            connection.send((trace, chain.best_maluspoints))
+
+        elif command == 'temperature':
+            chain.temperature = argument
+
+        elif command == 'best':
+            connection.send((chain.best_maluspoints, chain.best_schedule))
+
+        elif command == 'stop':
+            connection.close()
+            return
+
+
+class ParallelTempering(SimulatedAnnealing):
+    """
+    A class representing a parallel tempering (replica exchange) algorithm. Chains
+    at a ladder of fixed temperatures anneal in their own worker process, and every
+    swap_interval iterations chains at neighbouring temperatures swap temperatures with 
+    the acceptance probability of simulated annealing. Rounds alternate between the even
+    pairs of neighbouring temperatures (0 and 1, 2 and 3, ...) and the odd pairs (1 and 2, ...).
+
+    . . .
+
+    Attributes
+    ----------
+    temperatures: list[float]
+        temperature ladder, from cold to hot
+    swap_interval: int
+        number of iterations each chain runs between swap attempts
+    chain_temperatures: list[int]
+        index in the temperature ladder of the temperature of each chain
+    chain_maluspoints: list[int]
+        current maluspoints of each chain
+    swap_round: int
+        number of swap rounds so far, even rounds try the even pairs of temperatures
+    swap_attempts: int
+        number of attempted swaps between neighbouring temperatures
+    swap_acceptances: int
+        number of accepted swaps between neighbouring temperatures
+    """
+    def __init__(self, empty_schedule : Schedule, start_temperature : float, min_temperature : float=1, nr_chains : int=None, swap_interval : int=100, seed=None):
+        super().__init__(empty_schedule, start_temperature, cooling_function=None, seed=seed)
+        self.empty_schedule = empty_schedule
+        self.swap_interval = swap_interval
+
+        # use one chain per core by default
+        if nr_chains is None:
+            nr_chains = os.cpu_count() or 1
+
+        self.temperatures = self.get_temperature_ladder(min_temperature, start_temperature, nr_chains)
+        self.chain_temperatures = list(range(nr_chains))
+        self.chain_maluspoints = [self.schedule.total_maluspoints] * nr_chains
+        self.swap_round = 0
+        self.swap_attempts = 0
+        self.swap_acceptances = 0
+
+    def get_temperature_ladder(self, min_temperature : float, max_temperature : float, nr_chains : int) -> list[float]:
+        """
+        Returns nr_chains temperatures spaced geometrically from min_temperature to max_temperature.
+        A single chain runs at max_temperature, the temperature annealing starts from.
+        """
+        if nr_chains == 1:
+            return [max_temperature]
+
+        ratio = (max_temperature / min_temperature) ** (1 / (nr_chains - 1))
+
+        return [min_temperature * ratio ** i for i in range(nr_chains)]
+
+    def calculate_swap_probability(self, cold_chain : int, hot_chain : int) -> float:
+        """
+        Returns the probability of swapping the temperatures of two chains, using the
+        acceptance probability at the effective temperature 1 / (1/T_cold - 1/T_hot).
+        """
+        cold_temperature = self.temperatures[self.chain_temperatures[cold_chain]]
+        hot_temperature = self.temperatures[self.chain_temperatures[hot_chain]]
+
+        # always swap if both temperatures are the same
+        if cold_temperature == hot_temperature:
+            return 1
+
+        effective_temperature = 1 / (1 / cold_temperature - 1 / hot_temperature)
+
+        # the cold chain takes over the schedule of the hot chain
+        return self.calculate_acceptance_probability(self.chain_maluspoints[hot_chain], self.chain_maluspoints[cold_chain], effective_temperature)
+
+    def swap_temperatures(self, connections : list) -> None:
+        """
+        Attempts to swap the temperatures of the chains at the even or odd pairs of 
+        neighbouring temperatures and sends the changed temperatures to their chains.
+        """
+        changed = set()
+
+        # pairs (temperature index, next temperature index) of this round
+        for cold_index in range(self.swap_round % 2, len(self.temperatures) - 1, 2):
+
+            # find the chains at these temperatures now
+            cold_chain = self.chain_temperatures.index(cold_index)
+            hot_chain = self.chain_temperatures.index(cold_index + 1)
+            self.swap_attempts += 1
+
+            if self.rng.random() < self.calculate_swap_probability(cold_chain, hot_chain):
+                self.swap_acceptances += 1
+                self.chain_temperatures[cold_chain], self.chain_temperatures[hot_chain] = self.chain_temperatures[hot_chain], self.chain_temperatures[cold_chain]
+                changed.update((cold_chain, hot_chain))
+
+        self.swap_round += 1
+
+        for chain in changed:
+            connections[chain].send(('temperature', self.temperatures[self.chain_temperatures[chain]]))
+
+    def start_chains(self) -> tuple[list, list]:
+        """
+        Starts a worker process for each chain, all starting from the current schedule.
+        Returns the connections to and the processes of the chains.
+        """
+        start_schedule = CompactSchedule(self.schedule)
+        connections = []
+        processes = []
+
+        for chain, temperature_index in enumerate(self.chain_temperatures):
+            connection, chain_connection = multiprocessing.Pipe()
+            arguments = (chain_connection, self.empty_schedule, start_schedule, self.temperatures[temperature_index], self.rng.randrange(2**32))
+            process = multiprocessing.Process(target=run_chain, args=arguments, daemon=True)
+            process.start()
+
+            connections.append(connection)
+            processes.append(process)
+
+        return connections, processes
+
+    def stop_chains(self, connections : list, processes : list) -> None:
+        """
+        Stops the worker processes of the chains.
+        """
+        for connection in connections:
+            connection.send(('stop', None))
+            connection.close()
+
+        for process in processes:
+            process.join()
+
+    def run(self, iters : int):
+        """
+        Runs all chains for a number of iterations, swapping temperatures every swap_interval
+        iterations, and sets the schedule to the best schedule found by any chain.
+        Registered observers are notified with the maluspoints of the coldest chain.
+        """
+        self.iterations = iters
+        connections, processes = self.start_chains()
+
+        try:
+            for start in range(0, iters, self.swap_interval):
+                round_iterations = min(self.swap_interval, iters - start)
+                coldest_chain = self.chain_temperatures.index(0)
+
+                for connection in connections:
+                    connection.send(('run', round_iterations))
+
+                # collect the maluspoints of each chain
+                for chain, connection in enumerate(connections):
+                    trace, best_maluspoints = connection.recv()
+                    self.chain_maluspoints[chain] = trace[-1].total
+                    self.best_maluspoints = min(self.best_maluspoints, best_maluspoints)
+
+                    # keep the maluspoints of the chain at the lowest temperature
+                    if chain == coldest_chain:
+                        coldest_trace = trace
+
+                for i, maluspoints in enumerate(coldest_trace, start + 1):
+                    improved = bool(self.maluspoint_stats) and maluspoints.total < self.maluspoint_stats[-1]
+                    self.iteration += 1
+                    self.accept_schedule(maluspoints.total)
+
+                    if self.observers:
+                        self.notify_observers(i, maluspoints, improved)
+
+                self.swap_temperatures(connections)
+
+            # take the best schedule found by any of the chains
+            for connection in connections:
+                connection.send(('best', None))
+
+            best_maluspoints, best_schedule = min((connection.recv() for connection in connections), key=lambda best: best[0])
+
+        finally:
+            self.stop_chains(connections, processes)
+
+        # restore the best found schedule and update maluspoint count
+        if best_schedule is not None:
+            best_schedule.apply_to(self.schedule)
+            self.best_schedule = best_schedule
+
+        self.maluspoints = self.schedule.total_maluspoints
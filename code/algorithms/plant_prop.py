@@ -1,9 +1,8 @@
-import copy
-import random
 import math
-import matplotlib.pyplot as plt
 
 from ..classes.schedule import Schedule
+from ..classes.compact_schedule import CompactSchedule
+from ..visualization import plotting
 from .algorithm import Algorithm
 from .hillclimber import Hillclimber
 
@@ -19,15 +18,21 @@ class PlantProp(Algorithm):
     ----------
     N: int
         size of population at start of each iteration
-    population: list[Hillclimber]
-        a list of all current hillclimbers
+    population: list[CompactSchedule]
+        a list of the assignments of all current schedules, with the maluspoints they were scored with
+    climber: Hillclimber
+        hillclimber whose schedule is used to make and score the children of each schedule
     evaluation_stats: list[int]
         a list of the total number of evaluations after each iteration
     evaluation: int
         running counter of number of evaluations
+    best_maluspoints: int
+        maluspoints of the best schedule in the current population
+    worst_maluspoints: int
+        maluspoints of the worst schedule in the current population
     """
-    def __init__(self, schedule: Schedule, N : int=10, early_stopping : bool=False):
-        super().__init__(schedule)
+    def __init__(self, schedule: Schedule, N : int=10, early_stopping : bool=False, seed=None):
+        super().__init__(schedule, seed=seed)
         self.N = N
         self.population = []
         self.evaluation_stats = []
@@ -41,31 +46,47 @@ class PlantProp(Algorithm):
         """
         population_maluspoints = []
 
-        # loop over each hillclimber in population and append it's schedule's maluspoints
-        for hillclimber in self.population:
-            population_maluspoints.append(hillclimber.schedule.get_total_maluspoints())
+        # loop over each schedule in population and append it's (scored) maluspoints
+        for compact_schedule in self.population:
+            population_maluspoints.append(compact_schedule.total_maluspoints)
         
         return population_maluspoints
 
     def create_start_population(self) -> None:
         """
-        Adds N hillclimbers to start population.
+        Adds the start schedules of N hillclimbers to start population, the last 
+        hillclimber is kept to make children with.
         """
         for n in range(self.N):
-            self.population.append(Hillclimber(self.schedule))
+            self.climber = Hillclimber(self.schedule, seed=self.rng)
+            self.population.append(CompactSchedule(self.climber.schedule))
+
+        self.update_population_stats()
+
+    def update_population_stats(self) -> None:
+        """
+        Stores the best and worst maluspoints of the population for this generation.
+        """
+        population_maluspoints = self.get_population_maluspoints()
+        self.best_maluspoints = min(population_maluspoints)
+        self.worst_maluspoints = max(population_maluspoints)
     
     def update_population(self) -> None:
         """
-        Update population to be the best N hillclimbers.
+        Update population to be the best N schedules, ranked from best to worst 
+        on the maluspoints each schedule was scored with.
         """
-        self.population = sorted(self.population, key= lambda x: x.schedule.get_total_maluspoints())[:self.N]
+        self.population = sorted(self.population, key= lambda x: x.total_maluspoints)[:self.N]
+        self.update_population_stats()
 
-    def get_best_or_worst_schedule(self, worst : bool) -> Schedule:
+    def get_best_or_worst_schedule(self, worst : bool) -> CompactSchedule:
         """
-        Return the schedule of the best hillclimber in population.
+        Return the best (or worst) schedule in population.
         """
-        hillclimber = sorted(self.population, key= lambda x: x.schedule.get_total_maluspoints(), reverse=worst)[0]
-        return hillclimber.schedule
+        if worst:
+            return max(self.population, key= lambda x: x.total_maluspoints)
+
+        return min(self.population, key= lambda x: x.total_maluspoints)
     
     def check_improvement(self, previous_maluspoints : int, current_maluspoints : int) -> bool:
         """
@@ -73,41 +94,41 @@ class PlantProp(Algorithm):
         """
         return current_maluspoints < previous_maluspoints
     
-    def get_fitness(self, hillclimber : Hillclimber) -> float:
+    def get_fitness(self, schedule) -> float:
         """
-        Return the fitness of a hillclimber.
+        Return the fitness of a (compact) schedule.
         """
-        # get this climber's maluspoints
-        hillclimber_maluspoints = hillclimber.schedule.get_total_maluspoints()
+        # get this schedule's maluspoints
+        schedule_maluspoints = schedule.total_maluspoints
 
-        # get best and worst maluspoints from population
-        best_maluspoints = self.get_best_or_worst_schedule(worst=False).get_total_maluspoints()
-        worst_maluspoints = self.get_best_or_worst_schedule(worst=True).get_total_maluspoints()
+        # get best and worst maluspoints of this generation
+        best_maluspoints = self.best_maluspoints
+        worst_maluspoints = self.worst_maluspoints
 
         # calculate fitness
-        fitness = .5*(math.tanh(4 * ((best_maluspoints - hillclimber_maluspoints) / (best_maluspoints - worst_maluspoints + .1)) - 2) + 1)
+        fitness = .5*(math.tanh(4 * ((best_maluspoints - schedule_maluspoints) / (best_maluspoints - worst_maluspoints + .1)) - 2) + 1)
         
         return fitness
     
-    def calculate_children(self, hillclimber : Hillclimber, n_max : int=10) -> int:
+    def calculate_children(self, schedule, n_max : int=10) -> int:
         """
-        Return the number of children this hillclimber should make,
+        Return the number of children this schedule should make,
         maximum amount of children default is 10.
         """
         # get fitness and random number to calculate children
-        fitness = self.get_fitness(hillclimber)
-        random_number = random.random()
+        fitness = self.get_fitness(schedule)
+        random_number = self.rng.random()
 
         return math.ceil(fitness*random_number*n_max)
     
-    def calculate_mutations(self, hillclimber : Hillclimber, m_max=20):
+    def calculate_mutations(self, schedule, m_max=20):
         """
-        Return the number of mutations this hillclimber should make,
+        Return the number of mutations this schedule should make,
         maximum amount of mutations default is 20.
         """
         # get fitness and random number to calculate mutations
-        fitness = self.get_fitness(hillclimber)
-        random_number = random.random()
+        fitness = self.get_fitness(schedule)
+        random_number = self.rng.random()
 
         return math.ceil((1-fitness)*random_number*m_max)
     
@@ -118,18 +139,60 @@ class PlantProp(Algorithm):
         """
         children = []
 
-        # loop over all hill climbers and their number of children
-        for hillclimber in self.population:
-            for child in range(self.calculate_children(hillclimber)):
+        # loop over all schedules and their number of children
+        for compact_schedule in self.population:
+            number_children = self.calculate_children(compact_schedule)
+
+            # each child is a mutation of the previous child, starting from the parent
+            if number_children:
+                compact_schedule.apply_to(self.climber.schedule)
+
+            for child in range(number_children):
 
-                # mutate the child and append it to the list of children
-                hillclimber = copy.deepcopy(hillclimber)
-                hillclimber.mutate_schedule(self.calculate_mutations(hillclimber))
-                children.append(hillclimber)
+                # mutate the child and score it, only evaluating what the mutations changed
+                self.climber.mutate(self.calculate_mutations(self.climber.schedule))
+                self.climber.schedule.get_maluspoints_delta()
+
+                # store only the assignments of the child
+                children.append(CompactSchedule(self.climber.schedule))
         
         # add children to population
         self.population += children
 
+    def run_generation(self) -> bool:
+        """
+        Creates and mutates the children of the population, keeps the best N and stores 
+        the statistics of this generation. Returns whether the best maluspoints improved.
+        Registered observers are notified with the best schedule's maluspoints.
+        """
+        previous_best_maluspoints = self.best_maluspoints
+        
+        self.mutate_all()
+        
+        self.evaluation += len(self.population)
+        
+        self.update_population()
+        
+        current_best_maluspoints = self.best_maluspoints
+        
+        # append evaluations and best maluspoint status to plot later
+        self.evaluation_stats.append(self.evaluation)
+        self.maluspoint_stats.append(current_best_maluspoints)
+
+        # update no change counter according to imrpovement
+        improved = self.check_improvement(previous_best_maluspoints, current_best_maluspoints)
+        if improved:
+            self.no_change_counter = 0
+        else:
+            self.no_change_counter += 1
+
+        # pass on the maluspoints of the best schedule of this generation
+        if self.observers:
+            best_schedule = self.get_best_or_worst_schedule(worst = False)
+            self.notify_observers(len(self.maluspoint_stats), best_schedule.get_maluspoints(), improved)
+
+        return improved
+
     def run(self, evals : int=10) -> None:
         """
         Run plant propagation for a number of evaluations.
@@ -137,45 +200,28 @@ class PlantProp(Algorithm):
         # loop while current evaluation is lower than specified evaluataions
         while self.evaluation < evals:
             
-            previous_best_maluspoints = self.get_best_or_worst_schedule(worst = False).get_total_maluspoints()
-            
-            self.mutate_all()
-            
-            self.evaluation += len(self.population)
-            
-            self.update_population()
-            
-            current_best_maluspoints = self.get_best_or_worst_schedule(worst = False).get_total_maluspoints()
-            
-            # append evaluations and best maluspoint status to plot later
-            self.evaluation_stats.append(self.evaluation)
-            self.maluspoint_stats.append(current_best_maluspoints)
-
-            # update no change counter according to imrpovement
-            if self.check_improvement(previous_best_maluspoints, current_best_maluspoints):
-                self.no_change_counter = 0
-            else:
-                self.no_change_counter += 1
+            self.run_generation()
 
             # implement early stopping if stagnation
             if self.early_stopping:
                 if self.check_stagnation():
 
                     # save best schedule and maluspoints
-                    self.maluspoints = current_best_maluspoints
-                    self.schedule = self.get_best_or_worst_schedule(worst = False)
+                    self.maluspoints = self.maluspoint_stats[-1]
+                    self.get_best_or_worst_schedule(worst = False).apply_to(self.schedule)
 
                     print("stopping early due to a stagnation of improvements")
                     return
 
         # save best schedule and maluspoints
-        self.schedule = self.get_best_or_worst_schedule(worst = False)
-        self.maluspoints = self.schedule.get_total_maluspoints()
+        self.get_best_or_worst_schedule(worst = False).apply_to(self.schedule)
+        self.maluspoints = self.best_maluspoints
 
     def plot_graph(self, output_file : str, x : str='evaluation', y : str='maluspoints', title : str='Algorithm', save: bool=False):
         """
         Plot maluspoints as a function of number of evaluations (for hillclimber)
         """
+        import matplotlib.pyplot as plt
 
         # plot graph
         plt.plot(self.evaluation_stats, self.maluspoint_stats)
@@ -184,9 +230,6 @@ class PlantProp(Algorithm):
         plt.suptitle(title, fontsize=12)
         plt.title(f'N = {self.evaluation}', loc='center', fontsize=9)
         plt.title(f'final maluspoints = {self.maluspoint_stats[-1]}', loc='left', fontsize=9)
-        if save:
-            plt.savefig(output_file)
-
-        plt.show()
+        plotting.finish_figure(output_file if save else None)
             
     
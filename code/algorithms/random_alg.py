@@ -1,6 +1,5 @@
-import random
-
 from .algorithm import Algorithm
+from ..classes.archive import Archive
 
 
 class Random(Algorithm):
@@ -8,36 +7,37 @@ class Random(Algorithm):
     A class to represent a random algorithm.
     """
 
-    def __init__(self, empty_schedule) -> None:
-        super().__init__(empty_schedule)
+    def __init__(self, empty_schedule, seed=None) -> None:
+        super().__init__(empty_schedule, seed=seed)
         self.schedule_courses(self.schedule.archive)
         self.schedule_students()
+        self.schedule.update_switchable_activities(self.schedule.activities)
 
     def __repr__(self):
         return 'random_algorithm'
 
-    def pick_random_roomslot(self, archive : list) -> tuple:
-        """Pick random roomslot from archive"""
-        return random.choice(archive)  
+    def pick_random_roomslot(self, archive : Archive) -> int:
+        """Pick random roomslot id from archive"""
+        return archive.pick(self.rng)
     
-    def remove_roomslot(self, archive : list, roomslot : tuple) -> None:
+    def remove_roomslot(self, archive : Archive, roomslot : int) -> None:
         """Remove roomslot from archive"""
         archive.remove(roomslot)
 
-    def schedule_activity(self, activity, roomslot : tuple, archive : list) -> None:
+    def schedule_activity(self, activity, roomslot : int, archive : Archive) -> None:
         """
-        Schedule given activity on a roomslot from archive.
+        Schedule given activity on a roomslot (id) from archive.
         """
         # schedule the activity, and remove roomslot from archive
-        activity.schedule(roomslot[0], roomslot[1], roomslot[2])
+        self.schedule.schedule_activity(activity, roomslot)
         self.remove_roomslot(archive, roomslot)
 
-    def schedule_courses(self, archive : list) -> None:
+    def schedule_courses(self, archive : Archive) -> None:
         """
         Schedule all activities on a random roomslot that is available.
         """
         # shuffle activities list
-        random.shuffle(self.schedule.activities)
+        self.rng.shuffle(self.schedule.activities)
 
         # loop over all activities and pick a roomslot to schedule it
         for activity in self.schedule.activities:  
@@ -49,11 +49,11 @@ class Random(Algorithm):
         Pick a random tutorial/practical group that is not at full
         capacity from list of activities.
         """
-        activity = random.choice(activities)
+        activity = self.rng.choice(activities)
 
         # pick a new random group while current group is at full capacity
         while len(activity.students) == activity.capacity:
-            activity = random.choice(activities)
+            activity = self.rng.choice(activities)
         
         return activity
     
@@ -62,7 +62,7 @@ class Random(Algorithm):
         Add student to list of students in activity instance, and add
         activity to list of activities in student instance.
         """
-        student.activities.add(activity)
+        student.add_activity(activity)
         activity.students.add(student)
 
     def schedule_student_activities(self, activity_type : str, activities : list, student) -> None:       
@@ -86,7 +86,7 @@ class Random(Algorithm):
         Schedule all students in random activities for the courses they follow.
         """
         # shuffle list of students
-        random.shuffle(self.schedule.students)
+        self.rng.shuffle(self.schedule.students)
 
         # loop over all students and their courses
         for student in self.schedule.students:
@@ -95,9 +95,6 @@ class Random(Algorithm):
                 # schedule students to relevant activities of course
                 for activity_type, activities in course.activities.items():
                     self.schedule_student_activities(activity_type, activities, student)
-            
-        # update the students' personal schedule attribute
-        self.update_student_schedules()
 
 class FittedStart(Random):
     """
@@ -121,11 +118,13 @@ class FittedStart(Random):
             # initiate space left in room counter
             lowest_space_left = float('inf')
             
-            # loop over all available roomslots
-            for roomslot in archive:
+            # loop over all available roomslots, in a fixed order as removals reorder the archive
+            for roomslot, (room, day, time) in enumerate(self.schedule.roomslots):
+               if roomslot not in archive:
+                   continue
                
                # calculate the space left if the activity would be scheduled in this room
-               space_left = roomslot[0].capacity - activity.capacity
+               space_left = room.capacity - activity.capacity
 
                # keep track of best fitting room
                if space_left > 0 and space_left < lowest_space_left:
@@ -1,10 +1,9 @@
-import random
-import copy
 import math
-import matplotlib.pyplot as plt
 
 from .hillclimber import Hillclimber
 from ..classes.schedule import Schedule
+from ..classes.compact_schedule import CompactSchedule
+from ..visualization import plotting
 
 class SimulatedAnnealing(Hillclimber):
     """
@@ -22,27 +21,30 @@ class SimulatedAnnealing(Hillclimber):
         function used to update the temperature after every iteration
     switched_cooling_functions: bool
         whether algorithm has already switched cooling function
-    best_schedule: Schedule
-        current best schedule
+    best_schedule: CompactSchedule or None
+        snapshot of the current best schedule, None until a schedule is accepted
     best_maluspoints: float or int
         current best/ lowest maluspoint score 
 
     """
-    def __init__(self, empty_schedule : Schedule, start_temperature: int, cooling_function: str = 'exponential', early_stopping : bool=False):
-        super().__init__(empty_schedule)
+    def __init__(self, empty_schedule : Schedule, start_temperature: int, cooling_function: str = 'exponential', early_stopping : bool=False, seed=None):
+        super().__init__(empty_schedule, seed=seed)
         self.start_temperature = start_temperature
         self.temperature = start_temperature
         self.cooling_function = cooling_function
         self.switched_cooling_functions = False
-        self.best_schedule = self.schedule
+        self.best_schedule = None
         self.best_maluspoints = float('inf')
 
-    def calculate_acceptance_probability(self, new_maluspoints: int, old_maluspoints: int) -> float:
+    def calculate_acceptance_probability(self, new_maluspoints: int, old_maluspoints: int, temperature: float =None) -> float:
         """
         Calculates the acceptance probability as a function of the old and new maluspoints,
-        as well as the current temperature (self.temperature). Returning said acceptance
-        probability.
+        as well as the given temperature (by default the current temperature, self.temperature).
+        Returning said acceptance probability.
         """
+        if temperature is None:
+            temperature = self.temperature
+
         delta = old_maluspoints - new_maluspoints
         
         # only run calculations if delta negative 
@@ -50,7 +52,7 @@ class SimulatedAnnealing(Hillclimber):
             probability = 1
             
         else:
-            probability = 2 ** (delta / self.temperature)
+            probability = 2 ** (delta / temperature)
 
         return probability
 
@@ -109,27 +111,27 @@ class SimulatedAnnealing(Hillclimber):
         else:
             self.exponential_temperature_decline()
 
-    def check_improvement(self, previous_schedule: Schedule) -> None:
+    def check_improvement(self, previous_maluspoints: int) -> None:
         """
         Checks and accepts schedules better than the current/previous one, and sometimes
         accepts worse schedules, depending on the acceptance probability
         """
-        # compute maluspoints
-        previous_maluspoints = previous_schedule.get_total_maluspoints()
-        new_maluspoints = self.schedule.get_total_maluspoints()
+        # compute maluspoints by only evaluating what changed
+        self.schedule.get_maluspoints_delta()
+        new_maluspoints = self.schedule.total_maluspoints
 
         # obtain acceptance probability
         probability = self.calculate_acceptance_probability(new_maluspoints, previous_maluspoints)
 
         # if random number between 0 and 1 lower than probability accept change
-        if random.random() < probability:
-            self.accept_schedule(self.schedule)
+        if self.rng.random() < probability:
+            self.accept_schedule(new_maluspoints)
 
             # check whether new score is better than the previous best
             if new_maluspoints < self.best_maluspoints:
                 
-                # update best schedule and best maluspoints
-                self.best_schedule = copy.deepcopy(self.schedule)
+                # update best schedule (only its assignments) and best maluspoints
+                self.best_schedule = CompactSchedule(self.schedule)
                 self.best_maluspoints = new_maluspoints
 
             # if better score, reset no change counter
@@ -142,8 +144,8 @@ class SimulatedAnnealing(Hillclimber):
 
         # if the change is not accepted, revert changes and increase no change counter
         else:
-            self.accept_schedule(previous_schedule)
-            self.revert_to_previous_schedule(previous_schedule)
+            self.accept_schedule(previous_maluspoints)
+            self.revert_to_previous_schedule()
             self.increase_no_change_counter()
 
         self.update_temperature()
@@ -152,6 +154,7 @@ class SimulatedAnnealing(Hillclimber):
         """
         Plots statistics and also reports the starting temperature
         """
+        import matplotlib.pyplot as plt
         
         main_title = f"Simulated Annealing Algoritm"
         
@@ -169,8 +172,8 @@ class SimulatedAnnealing(Hillclimber):
         # check whether best_maluspoints has been updated since initialization
         if iters != 1 and self.best_maluspoints != float('inf'):
 
-            # update variables with best found schedule and maluspoint count
-            self.schedule = self.best_schedule
+            # restore the best found schedule and update maluspoint count
+            self.best_schedule.apply_to(self.schedule)
             self.maluspoints = self.best_maluspoints
 
 
@@ -187,8 +190,8 @@ class ReheatSimulatedAnnealing(SimulatedAnnealing):
     reheat_threshold: int
         number of iterations without any improvements after which to reheat
     """
-    def __init__(self, empty_schedule : Schedule, start_temperature: int, cooling_function: str = 'exponential', reheat_temperature: int = 10, reheat_threshold: int = 1500, early_stopping : bool=False):
-        super().__init__(empty_schedule, start_temperature, cooling_function)
+    def __init__(self, empty_schedule : Schedule, start_temperature: int, cooling_function: str = 'exponential', reheat_temperature: int = 10, reheat_threshold: int = 1500, early_stopping : bool=False, seed=None):
+        super().__init__(empty_schedule, start_temperature, cooling_function, seed=seed)
         self.reheat_temperature = reheat_temperature
         self.reheat_threshold = reheat_threshold
     
@@ -197,8 +200,8 @@ class ReheatSimulatedAnnealing(SimulatedAnnealing):
         print("reheating... :)")
         self.temperature = self.reheat_temperature
 
-    def check_improvement(self, previous_schedule: Schedule) -> None:
-        super().check_improvement(previous_schedule)
+    def check_improvement(self, previous_maluspoints: int) -> None:
+        super().check_improvement(previous_maluspoints)
 
         # if self.no_change_counter >= self.reheat_threshold:
         if self.no_change_counter >= self.reheat_threshold and self.temperature <= 1:
@@ -210,6 +213,8 @@ class ReheatSimulatedAnnealing(SimulatedAnnealing):
         """
         Plot maluspoints as a function of number of iterations (for hillclimber)
         """
+        import matplotlib.pyplot as plt
+
         # intialize variables
         iters = len(self.maluspoint_stats)
 
@@ -222,7 +227,4 @@ class ReheatSimulatedAnnealing(SimulatedAnnealing):
         plt.title(f'minimum maluspoints = {min(self.maluspoint_stats)}', loc='left', fontsize=9)
         plt.title(f'start temperature = {self.start_temperature}', loc='right', fontsize=9)
 
-        if save:
-            plt.savefig(output_file)
-
-        plt.show()
+        plotting.finish_figure(output_file if save else None)
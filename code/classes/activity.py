@@ -1,3 +1,6 @@
+from .indexed_set import IndexedSet
+
+
 class Activity:
     """
     A class to represent an activity.
@@ -12,18 +15,34 @@ class Activity:
         how many students fit/are allowed in this activity
     course: Course
         what course (object) this activity is a part of
-    students: set[Student]
+    students: IndexedSet[Student]
         a set of all students signed up for this activity
+    room: Room
+        room this activity is scheduled in, None if not yet scheduled
+    day: str
+        day this activity is scheduled on
+    time: str
+        timeslot this activity is scheduled in
+    roomslot_id: int
+        id of the roomslot (in its schedule) this activity is scheduled in
     maluspoints: int
         score representitive of the number of student double bookings this activity is involved with
+        and the number of students that do not fit in its room
+    overcapacity_maluspoints: int
+        number of students that do not fit in its room at last evaluation
     """
     
     def __init__(self, name : str, capacity : int, course) -> None:
         self.name = name
         self.capacity = capacity
         self.course = course
-        self.students = set()
+        self.students = IndexedSet()
+        self.room = None
+        self.day = None
+        self.time = None
+        self.roomslot_id = None
         self.maluspoints = 0
+        self.overcapacity_maluspoints = 0
 
 
     def __repr__(self) -> str:
@@ -33,18 +52,31 @@ class Activity:
     def schedule(self, room, day, time) -> None:
         """
         Schedule this activity on the given day and time to given room.
+        Moves the activity in the schedules of its students as well.
         """
+        # take activity out of its previous timeslot in its students' schedules
+        if self.room:
+            for student in self.students:
+                student.remove_from_schedule(self)
+
         self.room = room
         self.day = day
         self.time = time
 
-        room.schedule[day][time] = self 
+        for student in self.students:
+            student.add_to_schedule(self)
 
-    def reset_maluspoints(self) -> None:
+    def get_overcapacity_maluspoints(self) -> int:
         """
-        Resets this activity's maluspoints to 0.
+        Sets and returns the number of students that do not fit in the room 
+        of this activity, updating this activity's maluspoints accordingly.
         """
-        self.maluspoints = 0
+        # replace the previous overcapacity share of this activity's maluspoints
+        self.maluspoints -= self.overcapacity_maluspoints
+        self.overcapacity_maluspoints = max(len(self.students) - self.room.capacity, 0)
+        self.maluspoints += self.overcapacity_maluspoints
+
+        return self.overcapacity_maluspoints
 
     def is_full(self) -> bool:
         """
@@ -0,0 +1,20 @@
+from .indexed_set import IndexedSet
+
+
+class Archive(IndexedSet):
+    """
+    A class to represent the free roomslots of a schedule, as an indexed set of
+    roomslot ids so adding, removing and picking a random roomslot take constant time.
+
+    . . .
+
+    Attributes
+    ----------
+    items: list[int]
+        ids of all free roomslots, in no particular order
+    positions: dict[int, int]
+        index of each free roomslot id in items
+    """
+
+    def __repr__(self) -> str:
+        return f'Archive({len(self.items)} free roomslots)'
@@ -0,0 +1,192 @@
+import numpy as np
+
+from .activity import Activity
+from .schedule import Maluspoints
+from .archive import Archive
+from .indexed_set import IndexedSet
+
+# all days and timeslots of the week, roomslot ids are based on their order
+DAYS = ['ma', 'di', 'wo', 'do', 'vr']
+TIMESLOTS = ['9', '11', '13', '15', '17']
+SLOTS_PER_ROOM = len(DAYS) * len(TIMESLOTS)
+
+# maluspoints for the number of free periods in one day (index), 3 or more is relaxed to 100
+FREE_PERIOD_MALUSPOINTS = np.array([0, 1, 3, 100, 100])
+
+
+class CompactSchedule:
+    """
+    A class to represent the assignments of a schedule as arrays over integer ids.
+    Copying, comparing and sending it to other processes is cheap compared to a
+    Schedule, and it can be applied back to any Schedule of the same data.
+
+    . . .
+
+    Attributes
+    ----------
+    student_numbers: tuple[int]
+        student numbers, the index of a student number is the student id (shared with the problem instance)
+    room_numbers: tuple[str]
+        room numbers, the index of a room number is the room id (shared with the problem instance)
+    room_capacities: np.ndarray
+        capacity for each room id
+    activity_keys: tuple[tuple[str, str]]
+        course name and activity name, the index of a key is the activity id
+    activity_capacities: np.ndarray
+        capacity for each activity id
+    activity_slots: np.ndarray
+        roomslot id (room id * 25 + day * 5 + timeslot) for each activity id
+    membership: np.ndarray
+        boolean matrix (students x activities), True if student follows activity
+    total_maluspoints: int
+        total maluspoints of the schedule when it was made compact
+    """
+
+    def __init__(self, schedule) -> None:
+        # take the ids of students and rooms from the problem instance, they do not depend on shuffling
+        instance = schedule.instance
+        activities = schedule.activities
+
+        self.student_numbers = instance.student_numbers
+        self.room_numbers = instance.room_numbers
+        self.room_capacities = np.array([capacity for room_number, capacity in sorted(instance.rooms)])
+        self.activity_keys = tuple((activity.course.name, activity.name) for activity in activities)
+        self.activity_capacities = np.array([activity.capacity for activity in activities])
+
+        # map objects to their ids
+        room_ids = instance.room_ids
+        activity_ids = {activity: activity_id for activity_id, activity in enumerate(activities)}
+
+        self.activity_slots = np.empty(len(activities), dtype=np.int32)
+
+        # store the roomslot of each activity
+        for activity_id, activity in enumerate(activities):
+            room_id = room_ids[activity.room.room_number]
+            day = DAYS.index(activity.day)
+            time = TIMESLOTS.index(activity.time)
+
+            self.activity_slots[activity_id] = self.get_roomslot_id(room_id, day, time)
+
+        self.membership = np.zeros((len(self.student_numbers), len(activities)), dtype=bool)
+        self.total_maluspoints = schedule.total_maluspoints
+
+        # store the activities each student follows
+        for student in schedule.students:
+            student_id = instance.student_ids[student.student_number]
+
+            for activity in student.activities:
+                self.membership[student_id, activity_ids[activity]] = True
+
+    def __repr__(self) -> str:
+        return f'CompactSchedule({len(self.student_numbers)} students, {len(self.activity_keys)} activities)'
+
+    def get_roomslot_id(self, room_id : int, day : int, time : int) -> int:
+        """
+        Returns the roomslot id of a room id, day index and timeslot index.
+        """
+        return room_id * SLOTS_PER_ROOM + day * len(TIMESLOTS) + time
+
+    def split_roomslot_id(self, roomslot_id : int) -> tuple[int, int, int]:
+        """
+        Returns the room id, day index and timeslot index of a roomslot id.
+        """
+        room_id, slot = divmod(int(roomslot_id), SLOTS_PER_ROOM)
+        day, time = divmod(slot, len(TIMESLOTS))
+
+        return room_id, day, time
+
+    def get_student_slot_counts(self) -> np.ndarray:
+        """
+        Returns the number of activities of each student per day and timeslot
+        (students x days x timeslots).
+        """
+        # one-hot matrix of the day and timeslot of each activity (activities x 25 slots)
+        slots = np.zeros((len(self.activity_keys), len(DAYS) * len(TIMESLOTS)), dtype=np.int32)
+        slots[np.arange(len(self.activity_keys)), self.activity_slots % SLOTS_PER_ROOM] = 1
+
+        counts = self.membership.astype(np.int32) @ slots
+
+        return counts.reshape(len(self.student_numbers), len(DAYS), len(TIMESLOTS))
+
+    def get_maluspoints(self):
+        """
+        Returns each type of maluspoints and their total (Maluspoints), computed on the arrays.
+        """
+        # evening slots are only used by the largest room, any activity in one counts
+        evening = 5 * int(np.count_nonzero(self.activity_slots % len(TIMESLOTS) == TIMESLOTS.index('17')))
+
+        # students that do not fit in the room of their activity
+        activity_rooms = self.activity_slots // SLOTS_PER_ROOM
+        overcapacity = int(np.clip(self.membership.sum(axis=0) - self.room_capacities[activity_rooms], 0, None).sum())
+
+        counts = self.get_student_slot_counts()
+
+        # each extra activity in a timeslot is a double booking
+        double_booking = int(np.clip(counts - 1, 0, None).sum())
+
+        # free periods lie between the first and last occupied timeslot of a day
+        occupied = counts > 0
+        first = occupied.argmax(axis=2)
+        last = len(TIMESLOTS) - 1 - occupied[:, :, ::-1].argmax(axis=2)
+        free_periods = np.where(occupied.any(axis=2), last - first + 1 - occupied.sum(axis=2), 0)
+        free_period = int(FREE_PERIOD_MALUSPOINTS[free_periods].sum())
+
+        return Maluspoints(evening + overcapacity + free_period + double_booking, 
+                           evening, 
+                           overcapacity, 
+                           free_period, 
+                           double_booking)
+
+    def apply_to(self, schedule) -> None:
+        """
+        Changes the given schedule (of the same data) to the assignments of this
+        compact schedule, creating or removing extra activities where needed.
+        """
+        courses = {course.name: course for course in schedule.courses}
+        roomslot_ids = {(room.room_number, day, time): roomslot_id for roomslot_id, (room, day, time) in enumerate(schedule.roomslots)}
+        students = {student.student_number: student for student in schedule.students}
+        current_activities = {(activity.course.name, activity.name): activity for activity in schedule.activities}
+
+        activities = []
+
+        # find the activity of each id, creating activities added after the current schedule
+        for (course_name, activity_name), capacity in zip(self.activity_keys, self.activity_capacities):
+            activity = current_activities.pop((course_name, activity_name), None)
+
+            if activity is None:
+                course = courses[course_name]
+                activity = Activity(activity_name, int(capacity), course)
+                course.activities[activity_name[0]].append(activity)
+
+            activities.append(activity)
+
+        # remove activities that were added to the current schedule but do not exist here
+        for activity in current_activities.values():
+            activity.course.activities[activity.name[0]].remove(activity)
+
+        # empty all roomslots, then schedule each activity in its roomslot
+        schedule.occupancy = [None] * len(schedule.roomslots)
+
+        for activity, roomslot_id in zip(activities, self.activity_slots):
+            room_id, day, time = self.split_roomslot_id(roomslot_id)
+            activity.students = IndexedSet()
+            schedule.schedule_activity(activity, roomslot_ids[(self.room_numbers[room_id], DAYS[day], TIMESLOTS[time])])
+
+        # sign up students for their activities
+        for student_number, followed in zip(self.student_numbers, self.membership):
+            student = students[student_number]
+            student.activities = set()
+
+            for activity_id in np.flatnonzero(followed):
+                student.activities.add(activities[activity_id])
+                activities[activity_id].students.add(student)
+
+            student.update_schedule()
+
+        # take over the activities (in the order of their ids) and rebuild the archive of free roomslots
+        schedule.activities = activities
+        schedule.archive = Archive(roomslot_id for roomslot_id, activity in enumerate(schedule.occupancy) if activity is None)
+        schedule.switchable_activities = IndexedSet()
+        schedule.update_switchable_activities(activities)
+
+        schedule.get_total_maluspoints()
@@ -0,0 +1,70 @@
+class IndexedSet:
+    """
+    A class to represent a set that can be sampled from. Items are kept in a list
+    to pick from, together with the position of each item in that list, so adding,
+    removing and picking a random item take constant time. Random choices can be
+    made directly on it, as it supports indexing.
+
+    . . .
+
+    Attributes
+    ----------
+    items: list
+        all items, in no particular order
+    positions: dict
+        index of each item in items
+    """
+
+    def __init__(self, items=()) -> None:
+        self.items = []
+        self.positions = {}
+
+        for item in items:
+            self.add(item)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.items})'
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index : int):
+        return self.items[index]
+
+    def __contains__(self, item) -> bool:
+        return item in self.positions
+
+    def add(self, item) -> None:
+        """
+        Adds an item, if it is not in the set yet.
+        """
+        if item not in self.positions:
+            self.positions[item] = len(self.items)
+            self.items.append(item)
+
+    def remove(self, item) -> None:
+        """
+        Removes an item, by moving the last item into its position.
+        """
+        position = self.positions.pop(item)
+        last_item = self.items.pop()
+
+        if last_item != item:
+            self.items[position] = last_item
+            self.positions[last_item] = position
+
+    def discard(self, item) -> None:
+        """
+        Removes an item if it is in the set.
+        """
+        if item in self.positions:
+            self.remove(item)
+
+    def pick(self, rng):
+        """
+        Returns a random item, drawn from the given random number generator.
+        """
+        return rng.choice(self.items)
@@ -0,0 +1,167 @@
+import csv
+import hashlib
+import os
+import pickle
+
+# columns of the students file with the names of the courses a student follows
+COURSE_COLUMNS = ['Vak1', 'Vak2', 'Vak3', 'Vak4', 'Vak5']
+
+# version of the loaded data format, changing it makes earlier cache files unused
+CACHE_VERSION = 2
+
+
+class ProblemInstance:
+    """
+    A class to represent the static data of the scheduling problem: the students,
+    courses and rooms as loaded from the data files. It never changes, so all
+    schedules made from one instance share it instead of copying it.
+
+    . . .
+
+    Attributes
+    ----------
+    students: list[tuple[str, int, frozenset[str]]]
+        full name, student number and course names of each student
+    courses: list[tuple[str, dict]]
+        name and activity amounts (number and capacity for each activity type) of each course
+    enrollments: dict[str, list[int]]
+        indices (in students) of the students following each course
+    rooms: list[tuple[str, int]]
+        room number and capacity of each room
+    student_numbers: tuple[int]
+        sorted student numbers, the index of a student number is the student id
+    student_ids: dict[int, int]
+        student id of each student number
+    room_numbers: tuple[str]
+        sorted room numbers, the index of a room number is the room id
+    room_ids: dict[str, int]
+        room id of each room number
+    """
+
+    def __init__(self, students_data : str, courses_data : str, rooms_data : str) -> None:
+        self.enrollments = {}
+        self.students = self.load_students(students_data)
+        self.courses = self.load_courses(courses_data)
+        self.rooms = self.load_rooms(rooms_data)
+
+        # number students and rooms by their (unique) numbers so ids do not depend on file order
+        self.student_numbers = tuple(sorted(number for name, number, course_names in self.students))
+        self.student_ids = {number: student_id for student_id, number in enumerate(self.student_numbers)}
+        self.room_numbers = tuple(sorted(number for number, capacity in self.rooms))
+        self.room_ids = {number: room_id for room_id, number in enumerate(self.room_numbers)}
+
+    @classmethod
+    def load(cls, students_data : str, courses_data : str, rooms_data : str, cache_dir : str=None):
+        """
+        Returns the problem instance of the given data files, loaded from a binary cache
+        file if the data files were loaded before. The cache file is named after a hash of
+        the data files, so changed data files are loaded again. The cache is stored in a
+        'cache' folder next to the students file by default.
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(students_data), 'cache')
+
+        # hash the contents of all data files
+        data_hash = hashlib.sha256(str(CACHE_VERSION).encode())
+
+        for data in (students_data, courses_data, rooms_data):
+            with open(data, 'rb') as data_file:
+                data_hash.update(data_file.read())
+
+        cache_file = os.path.join(cache_dir, f'instance_{data_hash.hexdigest()[:16]}.pickle')
+
+        if os.path.exists(cache_file):
+            with open(cache_file, 'rb') as instance_file:
+                return pickle.load(instance_file)
+
+        instance = cls(students_data, courses_data, rooms_data)
+
+        # write to a temporary file first, so processes loading at the same time never read half a file
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary_file = f'{cache_file}.{os.getpid()}.tmp'
+
+        with open(temporary_file, 'wb') as instance_file:
+            pickle.dump(instance, instance_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temporary_file, cache_file)
+
+        return instance
+
+    def __repr__(self) -> str:
+        return f'ProblemInstance({len(self.students)} students, {len(self.courses)} courses, {len(self.rooms)} rooms)'
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def get_static_data(self) -> list:
+        """
+        Returns the (mutable typed) objects of this instance that schedules refer to,
+        so copies of a schedule can share them.
+        """
+        return [course_names for name, number, course_names in self.students] + [activity_amounts for name, activity_amounts in self.courses]
+
+    def load_students(self, data : str) -> list[tuple[str, int, frozenset[str]]]:
+        """
+        Returns the full name, student number and course names of each student
+        in the students file and stores the students following each course in enrollments.
+        """
+        students = []
+
+        with open(data, newline='', encoding='utf-8-sig') as students_file:
+
+            # loop over rows, leaving out empty courses
+            for index, row in enumerate(csv.DictReader(students_file)):
+                course_names = frozenset(row[column] for column in COURSE_COLUMNS if row[column])
+                students.append((f"{row['Voornaam']} {row['Achternaam']}", int(row['Stud.Nr.']), course_names))
+
+                # add the index of this student to each of their courses
+                for course_name in course_names:
+                    self.enrollments.setdefault(course_name, []).append(index)
+
+        return students
+
+    def load_courses(self, data : str) -> list[tuple[str, dict]]:
+        """
+        Returns the name and activity amounts of each course in the courses file.
+        """
+        courses = []
+
+        with open(data, newline='', encoding='utf-8-sig') as courses_file:
+
+            # loop over rows (courses)
+            for row in csv.DictReader(courses_file):
+                course_students = self.enrollments.setdefault(row['Vak'], [])
+
+                # store the number of lectures and their capacity
+                lectures = (int(row['#Hoorcolleges']), len(course_students))
+                tutorials = (int(row['#Werkcolleges']), to_capacity(row['Max. stud. Werkcollege']))
+                practicals = (int(row['#Practica']), to_capacity(row['Max. stud. Practicum']))
+
+                # create dictionary of activity types and the amount for this course
+                activity_amounts = {'h' : lectures, 'w' : tutorials, 'p' : practicals}
+
+                courses.append((row['Vak'], activity_amounts))
+
+        return courses
+
+    def load_rooms(self, data : str) -> list[tuple[str, int]]:
+        """
+        Returns the room number and capacity of each room in the rooms file.
+        """
+        rooms = []
+
+        with open(data, newline='', encoding='utf-8-sig') as rooms_file:
+            for row in csv.DictReader(rooms_file):
+                rooms.append((row['Zaalnummber'], int(row['Max. capaciteit'])))
+
+        return rooms
+
+
+def to_capacity(value : str) -> int:
+    """
+    Returns the capacity in a data file cell, None if the cell is empty.
+    """
+    return int(value) if value else None
@@ -0,0 +1,98 @@
+import bisect
+
+from .indexed_set import IndexedSet
+
+
+class Ranking:
+    """
+    A class to represent objects (activities or students) ranked by their maluspoints.
+    Objects with the same maluspoints are kept together in a bucket, so an object moves
+    to another bucket in constant time when its maluspoints change, and objects at the
+    top of the ranking are found by walking the (few) distinct maluspoints from the top.
+
+    . . .
+
+    Attributes
+    ----------
+    buckets: dict[int, IndexedSet]
+        objects with each number of maluspoints
+    levels: list[int]
+        numbers of maluspoints objects have, in increasing order
+    scores: dict
+        maluspoints of each object when it was last updated
+    """
+
+    def __init__(self, objects=()) -> None:
+        self.buckets = {}
+        self.levels = []
+        self.scores = {}
+
+        for obj in objects:
+            self.update(obj)
+
+    def __repr__(self) -> str:
+        return f'Ranking({len(self.scores)} objects, maluspoints {self.levels})'
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __contains__(self, obj) -> bool:
+        return obj in self.scores
+
+    def update(self, obj) -> None:
+        """
+        Adds an object, or moves it to the bucket of its current maluspoints.
+        """
+        score = obj.maluspoints
+        previous_score = self.scores.get(obj)
+
+        if previous_score == score:
+            return
+
+        if previous_score is not None:
+            self.remove_from_bucket(obj, previous_score)
+
+        self.scores[obj] = score
+
+        # add a bucket for maluspoints no object had yet
+        if score not in self.buckets:
+            self.buckets[score] = IndexedSet()
+            bisect.insort(self.levels, score)
+
+        self.buckets[score].add(obj)
+
+    def discard(self, obj) -> None:
+        """
+        Removes an object if it is ranked.
+        """
+        previous_score = self.scores.pop(obj, None)
+
+        if previous_score is not None:
+            self.remove_from_bucket(obj, previous_score)
+
+    def remove_from_bucket(self, obj, score : int) -> None:
+        """
+        Removes an object from the bucket of the given maluspoints, and the bucket if it is empty.
+        """
+        bucket = self.buckets[score]
+        bucket.remove(obj)
+
+        if not bucket:
+            del self.buckets[score]
+            self.levels.remove(score)
+
+    def pick_top(self, rng, count : int):
+        """
+        Returns a random object from the count objects with most maluspoints,
+        drawn from the given random number generator.
+        """
+        index = rng.randrange(count)
+
+        # find the bucket the index falls in, counting from the most maluspoints
+        for score in reversed(self.levels):
+            bucket = self.buckets[score]
+
+            if index < len(bucket):
+                return bucket[index]
+
+            index -= len(bucket)
@@ -13,6 +13,10 @@ class Room:
         how many student fit in this room
     is_largest: bool
         whether this room object is the largest out of all objects
+    days: list[str]
+        days this room can be used on
+    timeslots: list[str]
+        timeslots this room can be used in, the evening slot only for the largest room
 
     """
     def __init__(self, room_number : str, capacity : int) -> None:
@@ -20,31 +24,18 @@ class Room:
         self.capacity = capacity
         self.is_largest = False
 
-        self.empty_schedule()
+        self.set_timeslots()
 
     def __repr__(self) -> str:
         return self.room_number
 
-    def empty_schedule(self, days : list[str] = ['ma', 'di', 'wo', 'do', 'vr'], timeslots : list[str] = ['9', '11', '13', '15']) -> None:
+    def set_timeslots(self, days : list[str] = ['ma', 'di', 'wo', 'do', 'vr'], timeslots : list[str] = ['9', '11', '13', '15']) -> None:
         """
-        Create an empty schedule for this room, all timeslots are labeled None.
+        Sets the days and timeslots this room can be used in.
         """
-
-        # give evening slot to biggest room
+        # give evening slot to biggest room, without changing the default timeslots
         if self.is_largest:
-            timeslots.append('17')
-        else:
-            timeslots = ['9', '11', '13', '15']
+            timeslots = timeslots + ['17']
 
         self.timeslots = timeslots
         self.days = days
-
-        self.schedule = {}
-
-        # loop over each day and create a key with a dictionary for timeslots
-        for day in days:
-            self.schedule[day] = {}
-
-            # loop over each time slot and label it's value None
-            for timeslot in timeslots:
-                self.schedule[day][timeslot] = None
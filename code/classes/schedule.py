@@ -1,10 +1,16 @@
-import pandas as pd
 import copy
+from collections import namedtuple
 
 from .student import Student
 from .course import Course
 from .room import Room
 from .activity import Activity
+from .problem_instance import ProblemInstance
+from .archive import Archive
+from .indexed_set import IndexedSet
+
+# maluspoints of a schedule per type, in the order experiments record them
+Maluspoints = namedtuple('Maluspoints', ['total', 'evening', 'overcapacity', 'free_period', 'double_booking'])
 
 
 class Schedule:
@@ -15,6 +21,8 @@ class Schedule:
 
     Attributes
     ----------
+    instance: ProblemInstance
+        static data of the problem, shared by all copies of this schedule
     students: list[Student]
         to be scheduled students
     courses: list[Course]
@@ -24,9 +32,15 @@ class Schedule:
     activities: list[Activity]
         to be scheduled activities
     roomslots: list[tuple[Room, str, str]]
-        all roomslots in the schedule
-    archive: list[tupe[Room, str, str]]
-        all available roomslots
+        all roomslots in the schedule (by room, day and timeslot), the index of a roomslot is its id
+    occupancy: list[Activity]
+        activity scheduled in each roomslot id, None if the roomslot is empty
+    evening_roomslots: list[int]
+        ids of the evening roomslots (of the largest room)
+    archive: Archive
+        ids of all available roomslots
+    switchable_activities: IndexedSet[Activity]
+        tutorials and practicals with students and another group of the same type to switch them to
     room_maluspoints: int
         maluspoints for usage of the evening room slot
     double_booking_maluspoints: int
@@ -37,17 +51,25 @@ class Schedule:
         sum of maluspoints for the amount of student that doesn't fit inside the planned room (capacity of the room)
     total_maluspoints: int
         sum of room, double bookings, free period, and overcapacity maluspoints
+    changed_students: set[Student]
+        students whose schedule changed since the last evaluation
+    changed_activities: set[Activity]
+        activities whose students or roomslot changed since the last evaluation
     """
 
-    def __init__(self, students_data : str, courses_data : str, rooms_data : str) -> None:
-        self.students = self.get_students_list(students_data)
-        self.courses = self.get_courses_list(courses_data, self.students)
+    def __init__(self, instance : ProblemInstance) -> None:
+        self.instance = instance
+        self.students = self.get_students_list(instance)
+        self.courses = self.get_courses_list(instance, self.students)
         self.add_students_courses(self.students, self.courses)
-        self.rooms = self.get_rooms_list(rooms_data)
+        self.rooms = self.get_rooms_list(instance)
         self.set_largest_room(self.rooms)
         self.activities = self.get_activities_list(self.courses)
         self.roomslots = self.get_room_slots()
-        self.archive = copy.copy(self.roomslots)
+        self.occupancy = [None] * len(self.roomslots)
+        self.evening_roomslots = [roomslot_id for roomslot_id, (room, day, time) in enumerate(self.roomslots) if time == '17']
+        self.archive = Archive(range(len(self.roomslots)))
+        self.switchable_activities = IndexedSet()
         
         # initialise all maluspoints 
         self.room_maluspoints = 0
@@ -56,6 +78,24 @@ class Schedule:
         self.overcapacity_maluspoints = 0
         self.total_maluspoints = 0
 
+        # objects to re-evaluate when computing maluspoints incrementally
+        self.changed_students = set()
+        self.changed_activities = set()
+
+    def __deepcopy__(self, memo):
+        """
+        Returns a copy of this schedule that shares the static data of its problem instance.
+        """
+        # mark the static data as copied already, so the copy refers to the same objects
+        for static_data in self.instance.get_static_data():
+            memo[id(static_data)] = static_data
+
+        schedule = Schedule.__new__(Schedule)
+        memo[id(self)] = schedule
+        schedule.__dict__.update(copy.deepcopy(self.__dict__, memo))
+
+        return schedule
+
     def is_valid(self) -> bool:
         """
         Returns True if no student in this schedule has 3 free periods 
@@ -71,78 +111,47 @@ class Schedule:
         print("Schedule is valid!")
         return True
 
-    def get_students_list(self, data : str) -> list[Student]:
+    def get_students_list(self, instance : ProblemInstance) -> list[Student]:
         """
-        Iterate through students dataframe and create a Student class for each student.
+        Create a Student class for each student of the problem instance.
         Returns a list of students in the form of Student classes.
         """
-        # load data
-        data = pd.read_csv(data)
-
-        # add students' full name and courses as column
-        data['full_name'] = data['Voornaam'] + ' ' + data['Achternaam']
-        data['courses'] = data[['Vak1', 'Vak2', 'Vak3', 'Vak4', 'Vak5']].values.tolist()
-
         students_list = []
 
-        # loop over rows of dataframe and add Student instance to list.
-        for index, columns in data.iterrows():
-            students_list.append(Student(columns['full_name'], columns['Stud.Nr.'], set(columns['courses'])))
+        # course names are static, so students refer to those of the instance
+        for name, number, course_names in instance.students:
+            students_list.append(Student(name, number, course_names))
 
         return students_list
 
-    def get_courses_list(self, data : str, all_students : list[Student]) -> list[Course]:
+    def get_courses_list(self, instance : ProblemInstance, all_students : list[Student]) -> list[Course]:
         """
-        Iterate through courses dataframe and create a Course class for each Course.
+        Create a Course class for each course of the problem instance.
         Returns a list of courses in the form of Course instances.
         """
-        # load data
-        data = pd.read_csv(data)
-
         # initialize list
         courses_list = []
 
-        # loop over rows of dataframe (courses)
-        for index, columns in data.iterrows():
-
-            course_students = []
-
-            # loop over all students in any course
-            for student in all_students:
-
-                # add student to this course list if they follow the course
-                if columns['Vak'] in student.course_names:
-                    course_students.append(student)
-
-            # store the number of lectures and their capacity
-            lectures = (columns['#Hoorcolleges'], len(course_students))
-            tutorials = (columns['#Werkcolleges'], columns['Max. stud. Werkcollege'])
-            practicals = (columns['#Practica'], columns['Max. stud. Practicum'])
-
-            # create dictionary of activity types and the amount for this course
-            activity_amounts = {'h' : lectures, 'w' : tutorials, 'p' : practicals}
+        # loop over courses and the students following them
+        for name, activity_amounts in instance.courses:
+            course_students = [all_students[student_index] for student_index in instance.enrollments[name]]
 
             # add course to courses list
-            courses_list.append(Course(columns['Vak'], course_students, activity_amounts))
+            courses_list.append(Course(name, course_students, activity_amounts))
 
         return courses_list
 
-    def get_rooms_list(self, data : str) -> list[Room]:
+    def get_rooms_list(self, instance : ProblemInstance) -> list[Room]:
         """
-        Iterates through rooms dataframe and creates a Room object for each room.
+        Creates a Room object for each room of the problem instance.
         Returns a list of Room objects.
         """
-        # load data 
-        data = pd.read_csv(data)
-
         # initialize variable
         rooms_list = []
 
-        # loop over rows of dataframe
-        for index, columns in data.iterrows():
-
-            # add room info to rooms list
-            rooms_list.append(Room(columns['Zaalnummber'], columns['Max. capaciteit']))
+        # add room info to rooms list
+        for room_number, capacity in instance.rooms:
+            rooms_list.append(Room(room_number, capacity))
 
         return rooms_list
     
@@ -152,7 +161,7 @@ class Schedule:
         """
         largest_room = sorted(rooms, key=lambda room: room.capacity, reverse=True)[0]
         largest_room.is_largest = True
-        largest_room.empty_schedule()
+        largest_room.set_timeslots()
             
     
     def get_activities_list(self, courses : list[Course]) -> list[Activity]:
@@ -188,6 +197,26 @@ class Schedule:
 
         return room_slots
 
+    def schedule_activity(self, activity : Activity, roomslot_id : int) -> None:
+        """
+        Schedules an activity in the roomslot with the given id. Does not empty
+        the roomslot the activity was in before.
+        """
+        self.occupancy[roomslot_id] = activity
+        activity.roomslot_id = roomslot_id
+        activity.schedule(*self.roomslots[roomslot_id])
+
+    def update_switchable_activities(self, activities : list[Activity]) -> None:
+        """
+        Adds the given activities to the switchable activities if students can be
+        switched from them, removes them otherwise.
+        """
+        for activity in activities:
+            if activity.is_tutorial_practical() and activity.students and len(activity.course.activities[activity.name[0]]) > 1:
+                self.switchable_activities.add(activity)
+            else:
+                self.switchable_activities.discard(activity)
+
     def add_students_courses(self, students_list : list[Student], courses_list : list[Course]) -> None:
         """
         Add courses to students in the form of Course instances.
@@ -202,16 +231,12 @@ class Schedule:
         # reset maluspoints to zero
         self.room_maluspoints = 0
 
-        # loop over all rooms
-        for room in self.rooms:
-
-            # loop over all timeslots
-            if room.is_largest:
-                for timeslots in room.schedule.values():
+        # loop over the evening roomslots, only the largest room has them
+        for roomslot_id in self.evening_roomslots:
 
-                    # if largest and evening timeslot is being used, give 5 maluspoints
-                    if timeslots.get('17'):
-                        self.room_maluspoints += 5 
+            # if evening timeslot is being used, give 5 maluspoints
+            if self.occupancy[roomslot_id]:
+                self.room_maluspoints += 5 
 
         return self.room_maluspoints
     
@@ -222,18 +247,9 @@ class Schedule:
         # reset maluspoints
         self.overcapacity_maluspoints = 0
         
-        # loop over activities
+        # loop over activities and add the number of students over the room capacity
         for activity in self.activities:
-
-            # for each student in an activity over the room capacity assign 1 point (also to said activity)
-            if len(activity.students) > activity.room.capacity:
-
-                # calculate how many students are over capacity
-                number_too_many =  len(activity.students) - activity.room.capacity
-
-                # Increase maluspoint counters
-                self.overcapacity_maluspoints += number_too_many
-                activity.maluspoints += number_too_many
+            self.overcapacity_maluspoints += activity.get_overcapacity_maluspoints()
 
         return self.overcapacity_maluspoints
 
@@ -247,26 +263,21 @@ class Schedule:
 
         # loop over students and collect maluspoints 
         for student in self.students:
+            student.get_total_maluspoints()
             
             # increase maluspoints counters
-            self.double_booking_maluspoints += student.get_double_booking_malus_points()
-            self.free_period_maluspoints += student.get_free_period_malus_points()
-            student.get_total_maluspoints()
+            self.double_booking_maluspoints += student.double_booking_maluspoints
+            self.free_period_maluspoints += student.free_period_maluspoints
 
         return (self.free_period_maluspoints, self.double_booking_maluspoints)
-    
-    def reset_maluspoints_activities(self) -> None:
-        """
-        Resets the maluspoint count for all activities
-        """
-        for activity in self.activities:
-            activity.reset_maluspoints()
 
     def get_total_maluspoints(self) -> int:
         """
         Returns total amount of maluspoints for this schedule.
         """
-        self.reset_maluspoints_activities()
+        # everything is evaluated, so no changes are left to evaluate
+        self.changed_students.clear()
+        self.changed_activities.clear()
         
         # separate double bookings from free periods 
         student_maluspoints = self.get_student_maluspoints()
@@ -278,17 +289,65 @@ class Schedule:
                                   self.get_overcapacity_maluspoints())
 
         return self.total_maluspoints
+
+    def get_maluspoints(self) -> Maluspoints:
+        """
+        Returns the maluspoints of each type as computed at the last (full or incremental)
+        evaluation, without evaluating the schedule again.
+        """
+        return Maluspoints(self.total_maluspoints, 
+                           self.room_maluspoints, 
+                           self.overcapacity_maluspoints, 
+                           self.free_period_maluspoints, 
+                           self.double_booking_maluspoints)
+
+    def get_maluspoints_delta(self) -> Maluspoints:
+        """
+        Re-evaluates only the students and activities changed since the last evaluation
+        and updates the total maluspoints accordingly. Returns the change in each type
+        of maluspoints. Requires a full evaluation (get_total_maluspoints) beforehand.
+        """
+        previous_maluspoints = self.get_maluspoints()
+
+        # replace the overcapacity of changed activities
+        for activity in self.changed_activities:
+            self.overcapacity_maluspoints -= activity.overcapacity_maluspoints
+            self.overcapacity_maluspoints += activity.get_overcapacity_maluspoints()
+
+        # replace the free periods and double bookings of changed students
+        for student in self.changed_students:
+            self.free_period_maluspoints -= student.free_period_maluspoints
+            self.double_booking_maluspoints -= student.double_booking_maluspoints
+
+            student.get_total_maluspoints()
+
+            self.free_period_maluspoints += student.free_period_maluspoints
+            self.double_booking_maluspoints += student.double_booking_maluspoints
+
+        self.changed_students.clear()
+        self.changed_activities.clear()
+
+        # evening slots only exist in the largest room, so this is cheap to recompute
+        self.total_maluspoints = (self.get_evening_room_maluspoints() + 
+                                  self.free_period_maluspoints + 
+                                  self.double_booking_maluspoints + 
+                                  self.overcapacity_maluspoints)
+        
+        return Maluspoints(*(current - previous for current, previous in zip(self.get_maluspoints(), previous_maluspoints)))
     
-    def get_output(self, output : str) -> pd.DataFrame:
+    def get_output(self, output : str) -> 'pd.DataFrame':
         """
         Return output schedule as data frame and convert to csv-file 
         with given 'output' name.
         """
+        # import pandas only when writing output, so solver processes start faster
+        import pandas as pd
+
         rows = []
 
-        # loop over all activities of each student and append relevant info
+        # loop over all activities of each student (in a fixed order) and append relevant info
         for student in self.students:
-            for activity in student.activities:
+            for activity in sorted(student.activities, key=lambda activity: (activity.course.name, activity.name)):
                 
                 rows.append([student.name, 
                              activity.course, 
@@ -1,3 +1,23 @@
+# bit of each timeslot in a day mask of occupied timeslots
+TIMESLOT_BITS = {'9': 1, '11': 2, '13': 4, '15': 8, '17': 16}
+
+
+def count_free_periods(day_mask : int) -> int:
+    """
+    Returns the number of free timeslots between the first and last occupied 
+    timeslot in a day mask.
+    """
+    if not day_mask:
+        return 0
+
+    # drop free timeslots before the first activity
+    while not day_mask & 1:
+        day_mask >>= 1
+
+    # free timeslots are the unset bits below the last activity
+    return day_mask.bit_length() - bin(day_mask).count('1')
+
+
 class Student:
     """
     A class to represent a student.
@@ -8,29 +28,47 @@ class Student:
     ----------
     name: str
         student name
-    student_number: str
+    student_number: int
         number identifying student
     course_names: set[str]
         the names for all courses a student is signed up for
-    courses: set[Course]
+    courses: list[Course]
         the course objects for all courses in course_names
     activities: set[Activity]
         all actvities a student is signed up for
+    group_activities: dict[tuple[Course, str], Activity]
+        tutorial or practical group a student is signed up for, for each course and activity type
     schedule: dict
         current weekly schedule
+    day_masks: dict[str, int]
+        for each day a bitmask of occupied timeslots (see TIMESLOT_BITS)
+    double_bookings: int
+        current number of extra activities in occupied timeslots
     maluspoints: int
         score representitive of number of free periods and double bookings
+    free_period_maluspoints: int
+        maluspoints for free periods at last evaluation
+    double_booking_maluspoints: int
+        maluspoints for double bookings at last evaluation
+    double_booked_activities: list[Activity]
+        activities that received a maluspoint for a double booking of this student at last evaluation
     three_free_periods: bool
         whether student has three consecutive free periods in current schedule
     """
-    def __init__(self, name : str, number : str, course_names = set[str]) -> None:
+    def __init__(self, name : str, number : int, course_names = set[str]) -> None:
         self.name = name
         self.student_number = number
         self.course_names = course_names
-        self.courses = set()
+        self.courses = []
         self.activities = set()
+        self.group_activities = {}
         self.schedule = self.empty_schedule()
+        self.day_masks = dict.fromkeys(self.schedule, 0)
+        self.double_bookings = 0
         self.maluspoints = 0
+        self.free_period_maluspoints = 0
+        self.double_booking_maluspoints = 0
+        self.double_booked_activities = []
         self.three_free_periods = False
 
     def __repr__(self) -> str:
@@ -38,12 +76,12 @@ class Student:
 
     def add_courses(self, all_courses : set) -> None:
         """
-        Add a student's courses to the set of courses as course class instances.
+        Add a student's courses to the list of courses as course class instances.
         Also removes NA values.
         """ 
         for course in all_courses:
             if course.name in self.course_names:
-                self.courses.add(course)
+                self.courses.append(course)
 
     def empty_schedule(self, days : list[str] = ['ma', 'di', 'wo', 'do', 'vr'], timeslots : list[str] = ['9', '11', '13', '15', '17']):
         """
@@ -66,18 +104,74 @@ class Student:
     def update_schedule(self):
         """
         Add student's activities to their schedule and return this schedule.
+        Also finds the tutorial and practical groups of the student again.
         """
         self.schedule = self.empty_schedule()
+        self.day_masks = dict.fromkeys(self.schedule, 0)
+        self.double_bookings = 0
+        self.group_activities = {}
         
         # loop over all activities of this student and add it to relevant day and time in schedule.
         for activity in self.activities:
-
-            # add activity to list of activities at that timeslot
-            self.schedule[activity.day][activity.time].append(activity)
+            self.add_to_schedule(activity)
+            self.add_group_activity(activity)
 
         return self.schedule
+
+    def add_to_schedule(self, activity) -> None:
+        """
+        Add activity to the timeslot it is scheduled in.
+        """
+        timeslot = self.schedule[activity.day][activity.time]
+
+        # an occupied timeslot means an extra double booking
+        if timeslot:
+            self.double_bookings += 1
+
+        timeslot.append(activity)
+        self.day_masks[activity.day] |= TIMESLOT_BITS[activity.time]
+
+    def remove_from_schedule(self, activity) -> None:
+        """
+        Remove activity from the timeslot it is scheduled in.
+        """
+        timeslot = self.schedule[activity.day][activity.time]
+        timeslot.remove(activity)
+
+        # timeslot is still occupied if the activity was double booked
+        if timeslot:
+            self.double_bookings -= 1
+        else:
+            self.day_masks[activity.day] &= ~TIMESLOT_BITS[activity.time]
+
+    def add_group_activity(self, activity) -> None:
+        """
+        Stores activity as the group of its course and type if it is a tutorial or practical.
+        """
+        if activity.is_tutorial_practical():
+            self.group_activities[(activity.course, activity.name[0])] = activity
+
+    def add_activity(self, activity) -> None:
+        """
+        Sign student up for activity and add it to their schedule.
+        """
+        self.activities.add(activity)
+        self.add_to_schedule(activity)
+        self.add_group_activity(activity)
+
+    def remove_activity(self, activity) -> None:
+        """
+        Sign student off from activity and remove it from their schedule.
+        """
+        self.activities.remove(activity)
+        self.remove_from_schedule(activity)
+
+        # forget the group, unless the student was already moved to another group
+        if self.group_activities.get((activity.course, activity.name[0])) is activity:
+            del self.group_activities[(activity.course, activity.name[0])]
     
-    def maluspoints_converter(self, number_empty_slots: int) -> int:
+    @staticmethod
+    def maluspoints_converter(number_empty_slots: int) -> int:
         """
         Converts empty slots of one day into malus points.
         """
@@ -102,41 +196,13 @@ class Student:
         free_period_maluspoints = 0
         self.three_free_periods = False
 
-        # loop over all days and respective timeslots
-        for day, timeslots in self.schedule.items():
-
-            # initialize variables
-            occupied_timeslots_indices = []
-            free_period_count = 0
-
-            # get list of activities scheduled
-            slots = list(timeslots.values())
-
-            # loop over all indices and activities of timeslots
-            for i, occupied in enumerate(slots):
-
-                # obtain indices of all occupied timeslots
-                if occupied:
-                    occupied_timeslots_indices.append(i)
-
-            if occupied_timeslots_indices:
-
-                # obtain indices of first and last occupied timeslots
-                first_activity_index = occupied_timeslots_indices[0]
-                final_activity_index = occupied_timeslots_indices[-1]
-
-                # obtain number of free timeslots between first and last occupied ones
-                for i in range(first_activity_index, final_activity_index + 1):
-                    if not slots[i]:
-                        free_period_count += 1
+        # look up the maluspoints of each day's pattern of occupied timeslots
+        for day_mask in self.day_masks.values():
+            free_period_maluspoints += FREE_PERIOD_MALUSPOINTS[day_mask]
 
             # update attribute if student has 3 free periods in one day
-            if free_period_count == 3:
+            if THREE_FREE_PERIODS[day_mask]:
                 self.three_free_periods = True
-            
-            # convert into maluspoints for the day and add to total number
-            todays_maluspoints = self.maluspoints_converter(free_period_count)
-            free_period_maluspoints += todays_maluspoints
 
         return free_period_maluspoints
 
@@ -144,28 +210,32 @@ class Student:
         """
         Returns the sum of all malus points for the double bookigs of a student.
         """
-        double_booking_maluspoints = 0
+        # take back the maluspoints given to activities at the previous evaluation
+        for activity in self.double_booked_activities:
+            activity.maluspoints -= 1
 
-        # loop over days and timeslots
-        for day, timeslots in self.schedule.items():
-            for timeslot, activities in timeslots.items():
+        self.double_booked_activities = []
 
-                # if more than one activity is scheduled in timeslot
-                if len(activities) > 1:
+        # add maluspoint to each activity that shares its timeslot with another activity
+        if self.double_bookings:
+            for activity in self.activities:
+                if len(self.schedule[activity.day][activity.time]) > 1:
+                    activity.maluspoints += 1
+                    self.double_booked_activities.append(activity)
 
-                    # add student maluspoint for each activity over 1
-                    double_booking_maluspoints += (len(activities) - 1)
-
-                    # add maluspoint to each activity double booked
-                    for activity in activities:
-                        activity.maluspoints += 1
-
-        return double_booking_maluspoints
+        return self.double_bookings
 
     def get_total_maluspoints(self):
         """
         Returns and sets total number of maluspoints for this student
         """
-        self.maluspoints = self.get_free_period_malus_points() + self.get_double_booking_malus_points()
+        self.free_period_maluspoints = self.get_free_period_malus_points()
+        self.double_booking_maluspoints = self.get_double_booking_malus_points()
+        self.maluspoints = self.free_period_maluspoints + self.double_booking_maluspoints
 
         return self.maluspoints
+
+
+# maluspoints and three free periods flag for each of the 32 possible day masks
+FREE_PERIOD_MALUSPOINTS = [Student.maluspoints_converter(count_free_periods(day_mask)) for day_mask in range(32)]
+THREE_FREE_PERIODS = [count_free_periods(day_mask) == 3 for day_mask in range(32)]
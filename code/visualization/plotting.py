@@ -0,0 +1,70 @@
+import multiprocessing
+import pickle
+
+# reporting mode settings: headless figures are never shown and are saved in a separate
+# process with the given dpi (None keeps the dpi asked for by the plot)
+settings = {'headless': False, 'dpi': None}
+
+# processes still saving figures
+renders = []
+
+
+def set_reporting_mode(headless : bool=True, dpi : int=None) -> None:
+    """
+    Sets whether figures are shown (interactive) or only saved in the background (headless),
+    and the resolution figures are saved with.
+    """
+    settings['headless'] = headless
+    settings['dpi'] = dpi
+
+    # headless runs do not need a window system
+    if headless:
+        import matplotlib
+        matplotlib.use('Agg')
+
+
+def save_figure(figure_data : bytes, output_file : str, dpi : int) -> None:
+    """
+    Saves a pickled figure to output_file, runs in a separate process.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+
+    figure = pickle.loads(figure_data)
+    figure.savefig(output_file, dpi=dpi)
+
+
+def finish_figure(output_file : str=None, dpi : int=None, show : bool=True) -> None:
+    """
+    Saves the current figure to output_file (if given) and shows it. In reporting mode
+    the figure is closed instead of shown, and saved in a separate process so the caller
+    does not wait for rendering.
+    """
+    import matplotlib.pyplot as plt
+
+    figure = plt.gcf()
+    dpi = settings['dpi'] or dpi or 'figure'
+
+    if not settings['headless']:
+        if output_file:
+            figure.savefig(output_file, dpi=dpi)
+
+        if show:
+            plt.show()
+
+        return
+
+    if output_file:
+        process = multiprocessing.Process(target=save_figure, args=(pickle.dumps(figure), output_file, dpi))
+        process.start()
+        renders.append(process)
+
+    plt.close(figure)
+
+
+def wait_for_renders() -> None:
+    """
+    Waits until all figures saved in the background are written.
+    """
+    while renders:
+        renders.pop().join()
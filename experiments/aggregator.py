@@ -0,0 +1,69 @@
+import numpy as np
+import csv
+
+
+class OnlineAggregator:
+    """
+    A class to aggregate maluspoints per iteration over runs as the runs come in,
+    without keeping the runs themselves in memory.
+
+    . . .
+
+    Attributes
+    ----------
+    nr_iterations: int
+        number of iterations of each run
+    nr_types: int
+        number of maluspoint types recorded per iteration
+    runs: int
+        number of runs aggregated so far
+    mean: np.ndarray
+        running mean per iteration and type (iterations x types)
+    minimum: np.ndarray
+        running minimum per iteration and type
+    maximum: np.ndarray
+        running maximum per iteration and type
+    """
+
+    def __init__(self, nr_iterations : int, nr_types : int =5) -> None:
+        self.nr_iterations = nr_iterations
+        self.nr_types = nr_types
+        self.runs = 0
+
+        self.mean = np.zeros((nr_iterations, nr_types))
+        self.minimum = np.full((nr_iterations, nr_types), np.inf)
+        self.maximum = np.full((nr_iterations, nr_types), -np.inf)
+
+    def add_run(self, trace : list) -> None:
+        """
+        Adds the maluspoints of each iteration of one run to the aggregates.
+        """
+        values = np.asarray(trace, dtype=float).reshape(self.nr_iterations, self.nr_types)
+        self.runs += 1
+
+        # update the running mean
+        self.mean += (values - self.mean) / self.runs
+
+        np.minimum(self.minimum, values, out=self.minimum)
+        np.maximum(self.maximum, values, out=self.maximum)
+
+    def get_rows(self, start : int, end : int) -> np.ndarray:
+        """
+        Returns the average, min, and max of each type for iterations start to end,
+        as rows of (avg, min, max) repeated for every type.
+        """
+        rows = np.stack((self.mean[start:end], self.minimum[start:end], self.maximum[start:end]), axis=2)
+
+        return rows.reshape(end - start, 3 * self.nr_types)
+
+    def write_file(self, path : str, chunk_size : int =1000) -> None:
+        """
+        Writes the aggregates of the runs so far to a csv file, one row per iteration,
+        in chunks of chunk_size rows.
+        """
+        with open(path, 'w', newline='') as output_file:
+            result_writer = csv.writer(output_file, delimiter=',')
+
+            for start in range(0, self.nr_iterations, chunk_size):
+                end = min(start + chunk_size, self.nr_iterations)
+                result_writer.writerows(self.get_rows(start, end).tolist())
@@ -1,13 +1,15 @@
 from code.algorithms.hillclimber import Hillclimber
 from code.algorithms.heuristics_hillclimber import MutationProbabilityClimber, ProblematicActivityClimber, ProblematicStudentsClimber, IncreasingMutationsClimber
-from statistics import mean
+from experiments import runner
+from experiments.aggregator import OnlineAggregator
+from code.visualization import plotting
 
 import matplotlib.pyplot as plt
 import pandas as pd 
 import seaborn as sns
 import time
+import copy
 import os 
-import csv
 
 def select_version(version):
     """
@@ -28,47 +30,22 @@ def select_version(version):
     
     return algorithm
 
-def write_file(results, version, nr_climbers, nr_iterations):
-    """
-    Writes a csv file from results into the directory of the required version.  
-    """
-
-    # initialise list of average, min, max tuples   
-    values = []
-
-    # loop over zipped results 
-    for iteration in zip(*results):
-        
-        # unzip to get the same type maluspoints in one row 
-        iteration = list(zip(*list(iteration)))
-        
-        # append average, mean, and max of each type of maluspoints to values 
-        values.append((mean(iteration[0]), min(iteration[0]), max(iteration[0]),
-                       mean(iteration[1]), min(iteration[1]), max(iteration[1]),
-                       mean(iteration[2]), min(iteration[2]), max(iteration[2]),
-                       mean(iteration[3]), min(iteration[3]), max(iteration[3]),
-                       mean(iteration[4]), min(iteration[4]), max(iteration[4])))
-
-    # open the file and create writer 
-    with open(f"results/{version}/{version}_all_averages-{nr_climbers}-{nr_iterations}.csv", 'w', newline='') as output_file:
-        result_writer = csv.writer(output_file, delimiter=',')
-        
-        # write each value into separate row 
-        for value in values:
-            result_writer.writerow(value)
-
-def get_averages(schedule, version, nr_climbers: int =30, nr_iterations: int =20000):
+def get_averages(schedule, version, nr_climbers: int =30, nr_iterations: int =20000, seed=None, max_workers=None, write_every: int =5):
     """ 
     Writes a csv data file, storing the average, min, and max values of nr_climbers 
     per each of nr_iterations and for all types of maluspoints.   
     Stores the final schedule of each climber in a separate folder. 
+    Climbers run in parallel over max_workers processes (default one per core),
+    the data file (in chunks) holds the results of the climbers finished so far: it is
+    written every write_every finished climbers and after the last one.
     """
     
     # set timer 
     start_time = time.time()
 
-    # initialise results and maluspoints collector
-    results = [] 
+    # initialise results aggregator and maluspoints collector
+    results = OnlineAggregator(nr_iterations)
+    results_path = f"results/{version}/{version}_all_averages-{nr_climbers}-{nr_iterations}.csv"
     maluspoints = []
 
     # select algorithm version 
@@ -81,52 +58,30 @@ def get_averages(schedule, version, nr_climbers: int =30, nr_iterations: int =20
     if not os.path.exists(dir_path):
         os.makedirs(dir_path)
 
-    # set number of runs
-    for i in range(nr_climbers):
-        
-        # store results of each algorithm iteration 
-        result = []
-        
-        # make a hillclimber object  
-        climber = algorithm(schedule)
-
-        print(f"Running Hill Climber Number: {i}")
-        # set number iterations per run 
-        for j in range(nr_iterations):
-            
-            # keep track of iterations 
-            if j % 100 == 0:
-                print(j)
-            
-            # run the algorithm for one iteration 
-            climber.run(1)
-
-            # collect all maluspoints for iteration
-            evening = climber.schedule.get_evening_room_maluspoints()
-            overcapacity = climber.schedule.get_overcapacity_maluspoints()
-            free_period =  climber.schedule.get_student_maluspoints()[0]
-            double_booking = climber.schedule.get_student_maluspoints()[1]
-            total = double_booking + overcapacity + evening + free_period
-
-            # store maluspoints for iteration in results 
-            result.append((total, evening, overcapacity, free_period, double_booking))
+    # schedule to write the final schedules of the runs with
+    output_schedule = copy.deepcopy(schedule)
+
+    # run all climbers in parallel, collecting them in order
+    for i, result, final_schedule in runner.run_parallel(algorithm, schedule, nr_climbers, nr_iterations, seed, max_workers):
+
+        print(f"Finished Hill Climber Number: {i}")
 
         # store final maluspoints of this run separately 
-        maluspoints.append(total)
+        maluspoints.append(final_schedule.get_maluspoints().total)
 
         # store final schedules of each run  
-        climber.schedule.get_output(dir_path+f'/{version}{i + 1}_output.csv')
+        runner.write_output(final_schedule, output_schedule, dir_path+f'/{version}{i + 1}_output.csv')
+
+        # add iteration maluspoints to the aggregated results, and write the results so far every write_every runs
+        results.add_run(result)
 
-        # append iteration maluspoints to all results 
-        results.append(result)
+        if results.runs % write_every == 0 or results.runs == nr_climbers:
+            results.write_file(results_path)
  
     # store final maluspoints in separate file  
     maluspoints = pd.DataFrame(maluspoints, columns=['Final Maluspoints'])
     maluspoints.to_csv(dir_path+'/final_maluspoints.csv')
 
-    # write results file  
-    write_file(results, version, nr_climbers, nr_iterations)
-
     # stop the time and display amount of seconds for experiments 
     end_time = time.time()
     print(f'--- {round(end_time - start_time, 1)} seconds ---')
@@ -173,8 +128,7 @@ def plot_averages(version, nr_climbers: int =30, nr_iterations: int =20000):
     plt.xlabel('Iterations')
 
     # save figure 
-    fig.savefig(f"results/{version}/{version}_all_averages-{nr_climbers}-{nr_iterations}.png", dpi=1200)
-    plt.show()
+    plotting.finish_figure(f"results/{version}/{version}_all_averages-{nr_climbers}-{nr_iterations}.png", dpi=1200)
 
 def plot_zoom(version, nr_climbers: int =30, nr_iterations : int =20000, zoom_start : int =15000, zoom_end : int =20000):
     """
@@ -222,8 +176,7 @@ def plot_zoom(version, nr_climbers: int =30, nr_iterations : int =20000, zoom_st
     plt.xlabel('Iterations')
 
     # save figure 
-    fig.savefig(f"results/{version}/{version}_all_averages_zoom-{nr_climbers}-{nr_iterations}.png", dpi=1200)
-    plt.show()
+    plotting.finish_figure(f"results/{version}/{version}_all_averages_zoom-{nr_climbers}-{nr_iterations}.png", dpi=1200)
 
 def plot_maluspoints_distribution(version, nr_climbers=30, nr_iterations=20000):
     """
@@ -252,8 +205,7 @@ def plot_maluspoints_distribution(version, nr_climbers=30, nr_iterations=20000):
     plt.title(f'{nr_climbers} runs, {nr_iterations} iterations', loc='left', fontsize=9)
     
     # save figure 
-    plt.savefig(f'results/{version}/final_maluspoints-{nr_climbers}-{nr_iterations}.png', dpi=1200)
-    plt.show()
+    plotting.finish_figure(f'results/{version}/final_maluspoints-{nr_climbers}-{nr_iterations}.png', dpi=1200)
 
 def compare_distributions(type, nr_algorithms=30, nr_iterations=20000):
     """
@@ -293,8 +245,7 @@ def compare_distributions(type, nr_algorithms=30, nr_iterations=20000):
     plt.title(f'per algorithm: {nr_algorithms} runs, {nr_iterations} iterations', loc='left', fontsize=9)
     
     # save figure 
-    plt.savefig(f'results/hillclimber/{filename}-{nr_algorithms}-{nr_iterations}.png', dpi=1200)
-    plt.show()
+    plotting.finish_figure(f'results/hillclimber/{filename}-{nr_algorithms}-{nr_iterations}.png', dpi=1200)
 
     
 
@@ -1,28 +1,31 @@
+from experiments import runner
+from code.visualization import plotting
+
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-def run_algorithm(algorithm, schedule, runs):
+def run_algorithm(algorithm, schedule, runs, seed=None):
     """
     Runs random start algorithm for a number of run
     and keeps track of maluspoints of each run.
     """
     maluspoints = []
 
-    # loop for runs
-    for i in range(runs):
+    # loop for runs, each with its own random stream
+    for run_seed in runner.get_run_seeds(runs, seed):
 
         # fill the random schedule and append it's maluspoints
-        random_schedule = algorithm(schedule)
+        random_schedule = algorithm(schedule, seed=run_seed)
         maluspoints.append(random_schedule.schedule.get_total_maluspoints())
 
     return maluspoints
 
-def visualize_maluspoints_histogram(algorithm, schedule, runs=1000):
+def visualize_maluspoints_histogram(algorithm, schedule, runs=1000, seed=None):
     """
     Visualizes the distribution of maluspoints at the end of each run.
     """
     # run the algorithm and create one instance for the algorithm name
-    maluspoints = run_algorithm(algorithm, schedule, runs)
+    maluspoints = run_algorithm(algorithm, schedule, runs, seed)
     algorithm_instance = algorithm(schedule)
 
     # plot histogram
@@ -30,5 +33,5 @@ def visualize_maluspoints_histogram(algorithm, schedule, runs=1000):
     plt.xlabel('Number Maluspoints')
     plt.ylabel('Number Generated Schedules')
     plt.title('Distribution of maluspoints over randomly generated schedules')
-    plt.savefig(f'results/random/{algorithm_instance}_cost.png')
+    plotting.finish_figure(f'results/random/{algorithm_instance}_cost.png', show=False)
 
@@ -0,0 +1,55 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from code.classes.compact_schedule import CompactSchedule
+
+import random
+
+
+def get_run_seeds(nr_runs, seed=None):
+    """
+    Returns a seed for each run, derived from one experiment seed.
+    """
+    seed_generator = random.Random(seed)
+
+    return [seed_generator.randrange(2**32) for run in range(nr_runs)]
+
+def run_algorithm(algorithm, schedule, nr_iterations, seed, algorithm_kwargs):
+    """
+    Runs one algorithm with its own random stream (seed) for nr_iterations and returns the 
+    maluspoints of each iteration as (total, evening, overcapacity, free_period, double_booking) 
+    together with the final schedule as a CompactSchedule.
+    """
+    # make an algorithm object
+    run = algorithm(schedule, seed=seed, **algorithm_kwargs)
+
+    trace = []
+
+    # store the maluspoints the algorithm computed in each iteration in trace
+    run.add_observer(lambda iteration, maluspoints: trace.append(maluspoints))
+    run.run(nr_iterations)
+
+    return trace, CompactSchedule(run.schedule)
+
+def run_parallel(algorithm, schedule, nr_runs, nr_iterations, seed=None, max_workers=None, **algorithm_kwargs):
+    """
+    Runs nr_runs independent runs of an algorithm over a pool of processes (one per core
+    by default) and yields (run number, trace, final CompactSchedule) as runs finish, in order.
+    Keyword arguments are passed on to the algorithm.
+    """
+    seeds = get_run_seeds(nr_runs, seed)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = deque(executor.submit(run_algorithm, algorithm, schedule, nr_iterations, run_seed, algorithm_kwargs) for run_seed in seeds)
+
+        # take each future out of the queue, so its result is freed once the caller is done with it
+        for i in range(nr_runs):
+            trace, final_schedule = futures.popleft().result()
+            yield i, trace, final_schedule
+
+def write_output(final_schedule, schedule, output):
+    """
+    Writes a final schedule (CompactSchedule) of a run to a csv file with given 'output' name,
+    using a copy of the schedule the run started from.
+    """
+    final_schedule.apply_to(schedule)
+    schedule.get_output(output)
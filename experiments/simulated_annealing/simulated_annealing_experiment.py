@@ -1,55 +1,32 @@
 from code.algorithms.simulated_annealing import SimulatedAnnealing
-from statistics import mean
+from experiments import runner
+from experiments.aggregator import OnlineAggregator
+from code.visualization import plotting
 
 import matplotlib.pyplot as plt
 import pandas as pd 
 import seaborn as sns 
 import time 
+import copy
 import os 
-import csv
 
 
-def write_file(results, nr_algorithms, nr_iterations):
-    """
-    Writes a csv file from results. 
-    """
-
-    # initialise list of average, min, max tuples
-    values = []
-
-    # loop over zipped results 
-    for iteration in zip(*results):
-        
-        # unzip to get the same type maluspoints in one row 
-        iteration = list(zip(*list(iteration)))
-        
-        # append average, mean, and max of each type of maluspoints to values 
-        values.append((mean(iteration[0]), min(iteration[0]), max(iteration[0]),
-                       mean(iteration[1]), min(iteration[1]), max(iteration[1]),
-                       mean(iteration[2]), min(iteration[2]), max(iteration[2]),
-                       mean(iteration[3]), min(iteration[3]), max(iteration[3]),
-                       mean(iteration[4]), min(iteration[4]), max(iteration[4])))
-
-    # open the file and create writer 
-    with open(f"results/simulated_annealing/simulated_annealing_all_averages-{nr_algorithms}-{nr_iterations}.csv", 'w', newline='') as output_file:
-        result_writer = csv.writer(output_file, delimiter=',')
-        
-        # write each value into separate row 
-        for value in values:
-            result_writer.writerow(value)
-
-def get_averages(schedule, nr_algorithms: int =30, nr_iterations: int =20000, temp: int =50):
+def get_averages(schedule, nr_algorithms: int =30, nr_iterations: int =20000, temp: int =50, seed=None, max_workers=None, write_every: int =5):
     """ 
     Writes a csv data file, storing the average, min, and max values of nr_algorithms 
     per each of nr_iterations and for all types of maluspoints.   
     Stores thei final schedule of each simulated annealing algorithm in a separate folder. 
+    Algorithms run in parallel over max_workers processes (default one per core),
+    the data file (in chunks) holds the results of the algorithms finished so far: it is
+    written every write_every finished algorithms and after the last one.
     """
     
     # set timer 
     start_time = time.time()
 
-    # initialise results and maluspoints collector
-    results = [] 
+    # initialise results aggregator and maluspoints collector
+    results = OnlineAggregator(nr_iterations)
+    results_path = f"results/simulated_annealing/simulated_annealing_all_averages-{nr_algorithms}-{nr_iterations}.csv"
     maluspoints = []
     
     # make directory
@@ -59,53 +36,30 @@ def get_averages(schedule, nr_algorithms: int =30, nr_iterations: int =20000, te
     if not os.path.exists(dir_path):
         os.makedirs(dir_path)
 
-    # set number of runs
-    for i in range(nr_algorithms):
-        
-        # store results of each algorithm iteration 
-        result = []
-        
-        # make a simulated annealing object  
-        simal = SimulatedAnnealing(schedule, temp, cooling_function='exponential')
-        
-        print(f"Running Simulated Annealing Number: {i}")
-        
-        # set number iterations per run 
-        for j in range(nr_iterations):
-            
-            # keep track of iterations 
-            if j % 100 == 0:
-                print(j)
-            
-            # run the algorithm for one iteration 
-            simal.run(1)
+    # schedule to write the final schedules of the runs with
+    output_schedule = copy.deepcopy(schedule)
 
-            # collect all maluspoints for iteration      
-            evening = simal.schedule.get_evening_room_maluspoints()
-            overcapacity = simal.schedule.get_overcapacity_maluspoints()
-            free_period =  simal.schedule.get_student_maluspoints()[0]
-            double_booking = simal.schedule.get_student_maluspoints()[1]
-            total = double_booking + overcapacity + evening + free_period
+    # run all simulated annealing algorithms in parallel, collecting them in order
+    for i, result, final_schedule in runner.run_parallel(SimulatedAnnealing, schedule, nr_algorithms, nr_iterations, seed, max_workers, 
+                                                         start_temperature=temp, cooling_function='exponential'):
 
-            # store maluspoints for iteration in results 
-            result.append((total, evening, overcapacity, free_period, double_booking))
-
-        # store final maluspoints of this run separately 
-        print(f'final maluspoints for this run {total}')
+        # store final (best) maluspoints of this run separately 
+        total = final_schedule.get_maluspoints().total
+        print(f'final maluspoints for run {i}: {total}')
         maluspoints.append(total)
 
         # store final schedules of each run  
-        simal.schedule.get_output(dir_path+f'/simulated_annealing{i + 1}_output.csv')
+        runner.write_output(final_schedule, output_schedule, dir_path+f'/simulated_annealing{i + 1}_output.csv')
+
+        # add iteration maluspoints to the aggregated results, and write the results so far every write_every runs
+        results.add_run(result)
 
-        # append iteration maluspoints to all results 
-        results.append(result)
+        if results.runs % write_every == 0 or results.runs == nr_algorithms:
+            results.write_file(results_path)
 
     # store final maluspoints in separate file  
     maluspoints = pd.DataFrame(maluspoints, columns=['Final Maluspoints'])
     maluspoints.to_csv(dir_path+'/final_maluspoints.csv')
-
-    # write results file 
-    write_file(results, nr_algorithms, nr_iterations)
     
     # stop the time and display amount of seconds for experiments 
     end_time = time.time()
@@ -155,8 +109,7 @@ def plot_averages(nr_algorithms: int =30, nr_iterations: int =20000):
     plt.xlabel('Iterations')
 
     # save figure
-    fig.savefig(f"results/simulated_annealing/simulated_annealing_all_averages-{nr_algorithms}-{nr_iterations}.png", dpi=1200)
-    plt.show()
+    plotting.finish_figure(f"results/simulated_annealing/simulated_annealing_all_averages-{nr_algorithms}-{nr_iterations}.png", dpi=1200)
 
 def plot_zoom(nr_algorithms: int =30, nr_iterations : int =20000, zoom_start : int =15000, zoom_end : int =20000):
     """
@@ -205,8 +158,7 @@ def plot_zoom(nr_algorithms: int =30, nr_iterations : int =20000, zoom_start : i
     plt.xlabel('Iterations')
 
     # save figure 
-    fig.savefig(f"results/simulated_annealing/simulated_annealing_all_averages_zoom-{nr_algorithms}-{nr_iterations}.png", dpi=1200)
-    plt.show()
+    plotting.finish_figure(f"results/simulated_annealing/simulated_annealing_all_averages_zoom-{nr_algorithms}-{nr_iterations}.png", dpi=1200)
 
 def plot_maluspoints_distribution(nr_algorithms=30, nr_iterations=20000):
     """
@@ -235,10 +187,9 @@ def plot_maluspoints_distribution(nr_algorithms=30, nr_iterations=20000):
     plt.title(f'{nr_algorithms} runs, {nr_iterations} iterations', loc='left', fontsize=9)
     
     # save figure 
-    plt.savefig(f'results/simulated_annealing/final_maluspoints-{nr_algorithms}-{nr_iterations}.png', dpi=1200)
-    plt.show()
+    plotting.finish_figure(f'results/simulated_annealing/final_maluspoints-{nr_algorithms}-{nr_iterations}.png', dpi=1200)
 
-def temperature_comparisons(schedule, nr_algorithms=10, nr_iterations=1000, temps: list = [50, 100, 500]):
+def temperature_comparisons(schedule, nr_algorithms=10, nr_iterations=1000, temps: list = [50, 100, 500], seed=None, max_workers=None):
     """
     Makes simulated annealing runs from the range min_temp to max_temp increasing 
     by step. Stores results for each temperature in separate csv.   
@@ -247,41 +198,20 @@ def temperature_comparisons(schedule, nr_algorithms=10, nr_iterations=1000, temp
     # loop over temperatures 
     for temp in temps:
         
-        # collect results of this temperature 
-        results = []
+        # aggregate total maluspoints of this temperature 
+        results = OnlineAggregator(nr_iterations, nr_types=1)
         
-        # loop over number of algorithms 
-        for i in range(nr_algorithms):
-
-            # collect result of this algorithm 
-            result = []
-            
-            # make a simulated anneaing object 
-            simulated_annealing = SimulatedAnnealing(schedule, temp)
+        # run algorithms in parallel and keep the total maluspoints of each iteration
+        for i, result, final_schedule in runner.run_parallel(SimulatedAnnealing, schedule, nr_algorithms, nr_iterations, seed, max_workers, 
+                                                             start_temperature=temp):
 
-            print(f"Running Annealing: {i}")
+            print(f"Finished Annealing: {i}")
             
-            # run algorithm nr_iterations amount of times  
-            for j in range(nr_iterations):
-                    
-                    simulated_annealing.run(1)
-                    
-                    # append maluspoints to results of this run  
-                    result.append(simulated_annealing.schedule.get_total_maluspoints())
-            
-            #append this run to all runs of this temperature 
-            results.append(result)
-
-        # extract mean, min, and max of each iteration per temperature 
-        values = []
-        for iteration in zip(*results):
-            values.append((mean(iteration), min(iteration), max(iteration)))
+            # add this run to all runs of this temperature 
+            results.add_run([maluspoints[0] for maluspoints in result])
 
-        # write results into csv file 
-        with open(f"results/simulated_annealing/simulated_annealing_temp_{temp}.csv", 'w', newline='') as output_file:
-            result_writer = csv.writer(output_file, delimiter=',')
-            for value in values:
-                result_writer.writerow(value)
+        # write mean, min, and max of each iteration into csv file 
+        results.write_file(f"results/simulated_annealing/simulated_annealing_temp_{temp}.csv")
 
 
 def temperature_comparisons_plot(temps: list = [50, 100, 500], nr_algorithms=10, nr_iterations=1000):
@@ -324,5 +254,4 @@ def temperature_comparisons_plot(temps: list = [50, 100, 500], nr_algorithms=10,
     plt.legend(temp_names, title='Temperatures')
 
     # save figure 
-    fig.savefig(f"results/simulated_annealing/simulated_annealing_temps.png", dpi=1200)
-    plt.show()
\ No newline at end of file
+    plotting.finish_figure(f"results/simulated_annealing/simulated_annealing_temps.png", dpi=1200)
\ No newline at end of file
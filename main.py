@@ -1,28 +1,38 @@
+from code.algorithms.algorithm import print_progress
 from code.algorithms.random_alg import Random, FittedStart 
 from code.algorithms.hillclimber import Hillclimber
 from code.algorithms.simulated_annealing import SimulatedAnnealing, ReheatSimulatedAnnealing
+from code.algorithms.parallel_tempering import ParallelTempering
 from code.algorithms.plant_prop import PlantProp
+from code.algorithms.island_plant_prop import IslandPlantProp
 from code.algorithms.heuristics_hillclimber import ProblematicActivityClimber, ProblematicStudentsClimber, MutationProbabilityClimber, IncreasingMutationsClimber
 
 from code.classes.schedule import Schedule
+from code.classes.problem_instance import ProblemInstance
+from code.visualization import plotting
 
-from experiments.hillclimber import hillclimber_experiment
-from experiments.simulated_annealing import simulated_annealing_experiment
-from experiments.random import random_experiment
-
-import pandas as pd
 import argparse
 
 
-def main(algorithm, output_csv_name, output_png_name, experiment, iterations, early_stopping, starting_temperature, version):
-    test_schedule = Schedule('data/studenten_en_vakken.csv', 'data/vakken.csv', 'data/zalen.csv')
+def main(algorithm, output_csv_name, output_png_name, experiment, iterations, early_stopping, starting_temperature, version, seed, headless=False, dpi=None):
+    # in headless mode figures are saved in the background instead of shown
+    plotting.set_reporting_mode(headless, dpi)
+
+    instance = ProblemInstance.load('data/studenten_en_vakken.csv', 'data/vakken.csv', 'data/zalen.csv')
+    test_schedule = Schedule(instance)
+
+    # experiments need the plotting libraries, so only import them when running experiments
+    if experiment:
+        from experiments.hillclimber import hillclimber_experiment
+        from experiments.simulated_annealing import simulated_annealing_experiment
+        from experiments.random import random_experiment
 
     # ============== RANDOM ============================
     if algorithm == 'random':
         if version == 'normal':
             if not experiment: 
                 # create schedule using random algorithm
-                random_schedule = Random(test_schedule)
+                random_schedule = Random(test_schedule, seed=seed)
 
                 # display malus points
                 random_schedule.schedule.is_valid()
@@ -30,12 +40,12 @@ def main(algorithm, output_csv_name, output_png_name, experiment, iterations, ea
                 random_schedule.schedule.get_output(output_csv_name)
 
             if experiment:
-                random_experiment.visualize_maluspoints_histogram(Random, test_schedule)
+                random_experiment.visualize_maluspoints_histogram(Random, test_schedule, seed=seed)
 
         if version == 'fitted':
             if not experiment:
                 # create schedule using random algorithm
-                fitted_schedule = FittedStart(test_schedule)
+                fitted_schedule = FittedStart(test_schedule, seed=seed)
 
                 # display malus points
                 fitted_schedule.schedule.is_valid()
@@ -43,13 +53,14 @@ def main(algorithm, output_csv_name, output_png_name, experiment, iterations, ea
                 fitted_schedule.schedule.get_output(output_csv_name)
             
             if experiment:
-                random_experiment.visualize_maluspoints_histogram(FittedStart, test_schedule)
+                random_experiment.visualize_maluspoints_histogram(FittedStart, test_schedule, seed=seed)
 
     # ============== HILLCLIMBER =====================
     if algorithm == 'hillclimber':
         if version == 'normal':
             if not experiment:
-                hillclimber = Hillclimber(test_schedule, early_stopping)
+                hillclimber = Hillclimber(test_schedule, early_stopping, seed)
+                hillclimber.add_observer(print_progress, every=100)
                 hillclimber.run(iterations)
                 hillclimber.schedule.is_valid()
                 hillclimber.display_maluspoints_division('Hillclimber')
@@ -58,7 +69,7 @@ def main(algorithm, output_csv_name, output_png_name, experiment, iterations, ea
                 hillclimber.schedule.get_output(output_csv_name)
 
             if experiment:
-                hillclimber_experiment.get_averages(test_schedule, 'hillclimber')
+                hillclimber_experiment.get_averages(test_schedule, 'hillclimber', seed=seed)
                 hillclimber_experiment.plot_averages('hillclimber')
                 hillclimber_experiment.plot_maluspoints_distribution('hillclimber')
                 hillclimber_experiment.plot_zoom('hillclimber')
@@ -66,7 +77,8 @@ def main(algorithm, output_csv_name, output_png_name, experiment, iterations, ea
 
         if version == 'problematic activity':
             if not experiment:
-                problematic_activity_climber = ProblematicActivityClimber(test_schedule, early_stopping)
+                problematic_activity_climber = ProblematicActivityClimber(test_schedule, early_stopping, seed)
+                problematic_activity_climber.add_observer(print_progress, every=100)
                 problematic_activity_climber.run(iterations)
                 problematic_activity_climber.schedule.is_valid()
                 problematic_activity_climber.display_maluspoints_division('Problematic Activity Climber')
@@ -75,7 +87,7 @@ def main(algorithm, output_csv_name, output_png_name, experiment, iterations, ea
                 problematic_activity_climber.schedule.get_output(output_csv_name)
             
             if experiment:
-                hillclimber_experiment.get_averages(test_schedule, 'problematic_activity')
+                hillclimber_experiment.get_averages(test_schedule, 'problematic_activity', seed=seed)
                 hillclimber_experiment.plot_averages('problematic_activity')
                 hillclimber_experiment.plot_maluspoints_distribution('problematic_activity')
                 hillclimber_experiment.plot_zoom('problematic_activity')
@@ -83,7 +95,8 @@ def main(algorithm, output_csv_name, output_png_name, experiment, iterations, ea
 
         if version == 'problematic students':
             if not experiment:
-                problematic_student_climber = ProblematicStudentsClimber(test_schedule, early_stopping)
+                problematic_student_climber = ProblematicStudentsClimber(test_schedule, early_stopping, seed)
+                problematic_student_climber.add_observer(print_progress, every=100)
                 problematic_student_climber.run(iterations)
                 problematic_student_climber.schedule.is_valid()
                 problematic_student_climber.display_maluspoints_division('Problematic Student Climber')
@@ -92,7 +105,7 @@ def main(algorithm, output_csv_name, output_png_name, experiment, iterations, ea
                 problematic_student_climber.schedule.get_output(output_csv_name)
 
             if experiment:
-                hillclimber_experiment.get_averages(test_schedule, 'problematic_students')
+                hillclimber_experiment.get_averages(test_schedule, 'problematic_students', seed=seed)
                 hillclimber_experiment.plot_averages('problematic_students')
                 hillclimber_experiment.plot_maluspoints_distribution('problematic_students')
                 hillclimber_experiment.plot_zoom('problematic_students')
@@ -100,7 +113,8 @@ def main(algorithm, output_csv_name, output_png_name, experiment, iterations, ea
 
         if version == 'mutation probability':
             if not experiment:
-                mutation_probability_climber = MutationProbabilityClimber(test_schedule, early_stopping)
+                mutation_probability_climber = MutationProbabilityClimber(test_schedule, early_stopping, seed)
+                mutation_probability_climber.add_observer(print_progress, every=100)
                 mutation_probability_climber.run(iterations)
                 mutation_probability_climber.schedule.is_valid()
                 mutation_probability_climber.display_maluspoints_division('Mutation Probability Climber')
@@ -109,7 +123,7 @@ def main(algorithm, output_csv_name, output_png_name, experiment, iterations, ea
                 mutation_probability_climber.schedule.get_output(output_csv_name)
 
             if experiment:
-                hillclimber_experiment.get_averages(test_schedule, 'mutation_probability')
+                hillclimber_experiment.get_averages(test_schedule, 'mutation_probability', seed=seed)
                 hillclimber_experiment.plot_averages('mutation_probability')
                 hillclimber_experiment.plot_maluspoints_distribution('mutation_probability')
                 hillclimber_experiment.plot_zoom('mutation_probability')
@@ -117,7 +131,8 @@ def main(algorithm, output_csv_name, output_png_name, experiment, iterations, ea
 
         if version == 'increasing mutations':
             if not experiment:
-                increasing_mutations_climber = IncreasingMutationsClimber(test_schedule, early_stopping)
+                increasing_mutations_climber = IncreasingMutationsClimber(test_schedule, early_stopping, seed)
+                increasing_mutations_climber.add_observer(print_progress, every=100)
                 increasing_mutations_climber.run(iterations)
                 increasing_mutations_climber.schedule.is_valid()
                 increasing_mutations_climber.display_maluspoints_division('Increasing Mutations Climber')
@@ -126,14 +141,19 @@ def main(algorithm, output_csv_name, output_png_name, experiment, iterations, ea
                 increasing_mutations_climber.schedule.get_output(output_csv_name)
             
             if experiment:
-                hillclimber_experiment.get_averages(test_schedule, 'increasing_mutations')
+                hillclimber_experiment.get_averages(test_schedule, 'increasing_mutations', seed=seed)
                 hillclimber_experiment.plot_averages('increasing_mutations')
                 hillclimber_experiment.plot_maluspoints_distribution('increasing_mutations')
                 hillclimber_experiment.plot_zoom('increasing_mutations')
 
     # ======== PLANT PROPAGATION ===============
     if algorithm == 'plantprop':
-        plantprop = PlantProp(test_schedule, early_stopping=early_stopping)
+        if version == 'islands':
+            # one population per core, exchanging their best schedules
+            plantprop = IslandPlantProp(test_schedule, seed=seed)
+        else:
+            plantprop = PlantProp(test_schedule, early_stopping=early_stopping, seed=seed)
+
         plantprop.run(iterations)
         plantprop.schedule.is_valid()
         plantprop.display_maluspoints_division('Plantprop')
@@ -146,7 +166,8 @@ def main(algorithm, output_csv_name, output_png_name, experiment, iterations, ea
         if version == 'normal':
             if not experiment:
                 #create annealing schedule
-                simulated_annealing = SimulatedAnnealing(test_schedule, starting_temperature, cooling_function='exponential', early_stopping=early_stopping)
+                simulated_annealing = SimulatedAnnealing(test_schedule, starting_temperature, cooling_function='exponential', early_stopping=early_stopping, seed=seed)
+                simulated_annealing.add_observer(print_progress, every=100)
                 simulated_annealing.run(iterations)
                 simulated_annealing.schedule.is_valid()
                 simulated_annealing.display_maluspoints_division('Simulated Annealing')
@@ -156,19 +177,20 @@ def main(algorithm, output_csv_name, output_png_name, experiment, iterations, ea
             
             if experiment:
                 # simulated annealing experiment
-                simulated_annealing_experiment.get_averages(test_schedule)
+                simulated_annealing_experiment.get_averages(test_schedule, seed=seed)
                 simulated_annealing_experiment.plot_averages()
                 simulated_annealing_experiment.plot_maluspoints_distribution()
                 simulated_annealing_experiment.plot_zoom()
 
                 # temperature experiment
-                simulated_annealing_experiment.temperature_comparisons(test_schedule)
+                simulated_annealing_experiment.temperature_comparisons(test_schedule, seed=seed)
                 simulated_annealing_experiment.temperature_comparisons_plot()
         
         # ========= REHEATED SIMULATED ANNEALING ===============
         if version == 'reheated':
             # create schedule
-            reheat_simulated_annealing = ReheatSimulatedAnnealing(test_schedule, starting_temperature, cooling_function='exponential', reheat_threshold=1200, early_stopping=early_stopping)
+            reheat_simulated_annealing = ReheatSimulatedAnnealing(test_schedule, starting_temperature, cooling_function='exponential', reheat_threshold=1200, early_stopping=early_stopping, seed=seed)
+            reheat_simulated_annealing.add_observer(print_progress, every=100)
             reheat_simulated_annealing.run(iterations)
             reheat_simulated_annealing.schedule.is_valid()
             reheat_simulated_annealing.display_maluspoints_division('Reheat Simulated Annealing')
@@ -176,6 +198,18 @@ def main(algorithm, output_csv_name, output_png_name, experiment, iterations, ea
             reheat_simulated_annealing.plot_graph(output_png_name, title='Reheat Simulated Annealing Algorithm', save=True)
             reheat_simulated_annealing.schedule.get_output(output_csv_name)
 
+        # ========= PARALLEL TEMPERING ===============
+        if version == 'parallel tempering':
+            # create schedule with one chain per core
+            parallel_tempering = ParallelTempering(test_schedule, starting_temperature, seed=seed)
+            parallel_tempering.add_observer(print_progress, every=100)
+            parallel_tempering.run(iterations)
+            parallel_tempering.schedule.is_valid()
+            parallel_tempering.display_maluspoints_division('Parallel Tempering')
+
+            parallel_tempering.plot_graph(output_png_name, title='Parallel Tempering Algorithm', save=True)
+            parallel_tempering.schedule.get_output(output_csv_name)
+
     
 if __name__ == "__main__":
     # Set-up parsing command line arguments
@@ -190,9 +224,15 @@ if __name__ == "__main__":
     parser.add_argument("-es", "--early_stopping", action="store_true", help="early stopping(default: False)")
     parser.add_argument("-st", "--starting_temperature",   type=int, default = 50, help="starting temperature (default: 50)")
     parser.add_argument("-v", "--version", type=str, default='normal', help="algorithm version (default: normal)")
+    parser.add_argument("-sd", "--seed", type=int, default=None, help="random seed (default: None)")
+    parser.add_argument("-hl", "--headless", action="store_true", help="save figures in the background without showing them (default: False)")
+    parser.add_argument("-dpi", "--dpi", type=int, default=None, help="resolution of saved figures (default: per figure)")
 
     # Read arguments from command line
     args = parser.parse_args()
     
     # Run main with provide arguments
-    main(args.algorithm, args.output_csv, args.output_png, args.experiment, args.iterations, args.early_stopping, args.starting_temperature, args.version)
\ No newline at end of file
+    main(args.algorithm, args.output_csv, args.output_png, args.experiment, args.iterations, args.early_stopping, args.starting_temperature, args.version, args.seed, args.headless, args.dpi)
+
+    # wait for figures still being saved in the background
+    plotting.wait_for_renders()
\ No newline at end of file